@@ -0,0 +1,30 @@
+# cython: language_level=3
+# engage_compiler.pxd
+# C types for compiling engage_compiler.py with Cython.
+#
+# Build in place with:  cythonize -i engage_compiler.py
+# The extension module is imported in place of the .py file. The code is
+# unchanged; these declarations make the VM's dispatch loop run on C
+# integers. The opcodes become C globals, so compare against them rather
+# than reading them as attributes of the compiled module.
+
+cimport cython
+
+cdef Py_ssize_t LOAD_CONST, LOAD_LITERAL, LOAD_NAME, STORE_NAME, SET_NAME, POP
+cdef Py_ssize_t BINOP_ADD, BINOP_SUB, BINOP_MUL, BINOP_DIV, CMP_GT, CMP_LT, CMP_EQ, CMP_NE
+cdef Py_ssize_t BINOP_AND, BINOP_OR, UNARY_NOT, IS_RESULT_TYPE, JUMP, JUMP_IF_FALSE
+cdef Py_ssize_t CALL, RETURN, MAKE_FUNC, TRUTHY_OR_ZERO, EVAL_NODE, STORE_RESULT, HALT
+cdef Py_ssize_t LOAD_NAME_ADD_CONST, LOAD_NAME_SUB_CONST, LOAD_NAME_MUL_CONST
+cdef Py_ssize_t LOAD_NAME_LT_CONST, LOAD_NAME_GT_CONST, LOAD_NAME_LOAD_NAME_ADD
+cdef Py_ssize_t LOAD_LOCAL, STORE_LOCAL, SET_LOCAL, LOAD_GLOBAL
+cdef Py_ssize_t LOAD_LOCAL_ADD_CONST, LOAD_LOCAL_SUB_CONST, LOAD_LOCAL_MUL_CONST
+cdef Py_ssize_t LOAD_LOCAL_LT_CONST, LOAD_LOCAL_GT_CONST, LOAD_LOCAL_LOAD_LOCAL_ADD
+
+
+cdef class VM:
+    cdef public object interpreter, compiler, slot_bound_names, _slot_code_seen
+
+    @cython.locals(pc=Py_ssize_t, op=Py_ssize_t, argc=Py_ssize_t, loc=Py_ssize_t,
+                   dynamic_scopes=Py_ssize_t, error_count=Py_ssize_t,
+                   code=list, consts=list, stack=list, calls=list, values=list)
+    cpdef run(self, program, symbol_table)
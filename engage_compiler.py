@@ -0,0 +1,855 @@
+# engage_compiler.py
+# Bytecode compiler and stack VM for the Engage interpreter.
+#
+# The Compiler flattens an AST into a list of int opcodes with inline
+# operands plus a constant pool, and the VM runs that in a single dispatch
+# loop instead of recursing through Interpreter.visit for every node. Nodes
+# without an opcode of their own are embedded whole (EVAL_NODE) and
+# evaluated by the tree-walking Interpreter, which also remains the fallback
+# for code that cannot be compiled at all.
+#
+# The module can be compiled with Cython (cythonize -i engage_compiler.py);
+# engage_compiler.pxd types the VM's dispatch loop.
+
+from bisect import bisect_right
+
+from engage_parser import (VarAssignNode, SetNode, VarAccessNode, NumberNode, FuncDefNode, IfNode, WhileNode,
+                           TypeNameNode, MemberAccessNode)
+from engage_values import Number, String, Function, BuiltInFunction, BoundMethod, ResultValue, SymbolTable
+from engage_errors import EngageRuntimeError
+
+# --- Opcodes ---
+# Operands follow their opcode inline in the code list.
+
+LOAD_CONST = 0        # idx: push consts[idx]
+LOAD_LITERAL = 1      # idx: push consts[idx], a literal whose position becomes the frame's location
+LOAD_NAME = 2         # idx: push the value of variable consts[idx]
+STORE_NAME = 3        # idx: bind variable consts[idx] to the top of the stack (the value stays)
+SET_NAME = 4          # idx: as STORE_NAME, but the variable must already exist
+POP = 5
+BINOP_ADD = 6
+BINOP_SUB = 7
+BINOP_MUL = 8
+BINOP_DIV = 9
+CMP_GT = 10
+CMP_LT = 11
+CMP_EQ = 12
+CMP_NE = 13
+BINOP_AND = 14
+BINOP_OR = 15
+UNARY_NOT = 16
+IS_RESULT_TYPE = 17   # idx: replace the top of the stack with 1 if it is a Result of type consts[idx]
+JUMP = 18             # target
+JUMP_IF_FALSE = 19    # target: pop, and jump if the value is not true
+CALL = 20             # argc: the callee is on top of the stack, its arguments below it
+RETURN = 21
+MAKE_FUNC = 22        # idx: push a new Function from consts[idx] = (name, body_nodes, arg_names, code)
+TRUTHY_OR_ZERO = 23   # replace a falsy top of the stack with Number(0)
+EVAL_NODE = 24        # idx: push the Interpreter's value for AST node consts[idx]
+STORE_RESULT = 25     # pop a top-level statement's value into the program result
+HALT = 26
+
+# Superinstructions for the commonest expression shapes, one dispatch each.
+# The *_CONST forms take a variable and a raw (unboxed) number literal.
+LOAD_NAME_ADD_CONST = 27     # name_idx, const_idx: push name + literal
+LOAD_NAME_SUB_CONST = 28     # name_idx, const_idx: push name - literal
+LOAD_NAME_MUL_CONST = 29     # name_idx, const_idx: push name * literal
+LOAD_NAME_LT_CONST = 30      # name_idx, const_idx: push name < literal
+LOAD_NAME_GT_CONST = 31      # name_idx, const_idx: push name > literal
+LOAD_NAME_LOAD_NAME_ADD = 32  # name_idx, name_idx: push name + name
+
+# Slot-compiled functions keep their variables in a list indexed by slot
+LOAD_LOCAL = 33       # slot
+STORE_LOCAL = 34      # slot: the value stays on the stack
+SET_LOCAL = 35        # slot: as STORE_LOCAL, but the variable must already exist
+LOAD_GLOBAL = 36      # idx, cache: push the value of free variable consts[idx]
+LOAD_LOCAL_ADD_CONST = 37     # slot, const_idx
+LOAD_LOCAL_SUB_CONST = 38     # slot, const_idx
+LOAD_LOCAL_MUL_CONST = 39     # slot, const_idx
+LOAD_LOCAL_LT_CONST = 40      # slot, const_idx
+LOAD_LOCAL_GT_CONST = 41      # slot, const_idx
+LOAD_LOCAL_LOAD_LOCAL_ADD = 42  # slot, slot
+
+
+class CompileError(Exception):
+    """Raised for code the VM cannot run; callers fall back to the Interpreter."""
+
+
+class _NeedsSymbolTable(Exception):
+    """A function body needs its variables in a SymbolTable rather than slots."""
+
+
+class LocalScope:
+    """
+    Variables of one call to a slot-compiled function.
+
+    Looks like a SymbolTable to callees, stack traces and the Interpreter:
+    lookups of names it does not hold, or holds unset, continue in the
+    caller's scope.
+    """
+
+    __slots__ = ('values', 'slot_index', 'parent')
+
+    def __init__(self, values, slot_index, parent=None):
+        self.values = values
+        self.slot_index = slot_index
+        self.parent = parent
+
+    def get(self, name):
+        index = self.slot_index.get(name)
+        if index is not None:
+            value = self.values[index]
+            if value is not None:
+                return value
+        return self.parent.get(name) if self.parent else None
+
+    @property
+    def symbols(self):
+        values = self.values
+        return {name: values[index] for name, index in self.slot_index.items() if values[index] is not None}
+
+
+class CodeObject:
+    """A compiled block of Engage code: opcodes plus the tables the VM reads."""
+
+    def __init__(self, name, local_names=None):
+        self.name = name
+        # Slot -> name for slot-compiled functions; None when variables live in a SymbolTable
+        self.local_names = local_names
+        self.slot_index = None if local_names is None else {n: i for i, n in enumerate(local_names)}
+        self.code = []
+        self.consts = []
+        self.positions = {}         # LOAD_LITERAL pc -> (line, column) of its token
+        self.sources = {}           # LOAD_* operand pc -> VarAccessNode, for error reports
+        self.statement_starts = []  # pc of each top-level statement, for error recovery
+        # Inline caches of LOAD_GLOBAL sites: [global table version, value]
+        self.global_caches = []
+
+    def emit(self, op, *args):
+        """Append an instruction and its operands and return its pc."""
+        pc = len(self.code)
+        self.code.append(op)
+        self.code.extend(args)
+        return pc
+
+    def add_const(self, value):
+        """Add a value to the constant pool and return its index."""
+        self.consts.append(value)
+        return len(self.consts) - 1
+
+    def patch_jump(self, pc):
+        """Point the jump at pc to the next instruction to be emitted."""
+        self.code[pc + 1] = len(self.code)
+
+
+class Compiler:
+    """Compiles Engage ASTs into CodeObjects for the VM."""
+
+    BINARY_OPS = {
+        'plus': BINOP_ADD, '+': BINOP_ADD, 'concatenated with': BINOP_ADD,
+        'minus': BINOP_SUB, '-': BINOP_SUB,
+        'times': BINOP_MUL, '*': BINOP_MUL,
+        'divided by': BINOP_DIV, '/': BINOP_DIV,
+        'is greater than': CMP_GT, '>': CMP_GT,
+        'is less than': CMP_LT, '<': CMP_LT,
+        'is': CMP_EQ, '==': CMP_EQ,
+        'is not': CMP_NE, '!=': CMP_NE,
+        'and': BINOP_AND,
+        'or': BINOP_OR,
+    }
+
+    # <variable> <op> <number literal> fuses into one instruction
+    CONST_SUPERINSTRUCTIONS = {
+        BINOP_ADD: LOAD_NAME_ADD_CONST,
+        BINOP_SUB: LOAD_NAME_SUB_CONST,
+        BINOP_MUL: LOAD_NAME_MUL_CONST,
+        CMP_LT: LOAD_NAME_LT_CONST,
+        CMP_GT: LOAD_NAME_GT_CONST,
+    }
+    LOCAL_CONST_SUPERINSTRUCTIONS = {
+        BINOP_ADD: LOAD_LOCAL_ADD_CONST,
+        BINOP_SUB: LOAD_LOCAL_SUB_CONST,
+        BINOP_MUL: LOAD_LOCAL_MUL_CONST,
+        CMP_LT: LOAD_LOCAL_LT_CONST,
+        CMP_GT: LOAD_LOCAL_GT_CONST,
+    }
+
+    def compile_program(self, node):
+        """
+        Compile a ProgramNode.
+
+        Args:
+            node: The ProgramNode to compile
+
+        Returns:
+            CodeObject whose top-level statements each end in STORE_RESULT
+
+        Raises:
+            CompileError: If the program has to run on the Interpreter
+        """
+        block = CodeObject('<main>')
+        for statement in node.statements:
+            block.statement_starts.append(len(block.code))
+            self._compile(statement, block)
+            block.emit(STORE_RESULT)
+        block.emit(HALT)
+        return block
+
+    def compile_function(self, name, body_nodes, arg_names):
+        """
+        Compile a function body.
+
+        Args:
+            name: Function name
+            body_nodes: List of statement nodes
+            arg_names: Parameter names
+
+        Returns:
+            CodeObject that ends in RETURN
+
+        Raises:
+            CompileError: If the function has to run on the Interpreter
+        """
+        # Parameters and every name the body binds get a slot, unless some
+        # node needs the Interpreter, which reads and binds via a SymbolTable
+        if len(set(arg_names)) == len(arg_names):
+            local_names = list(dict.fromkeys([*arg_names, *self._bound_names(body_nodes)]))
+            block = CodeObject(name, local_names)
+            try:
+                self._compile_statements(body_nodes, block)
+                block.emit(RETURN)
+                return block
+            except _NeedsSymbolTable:
+                pass
+
+        block = CodeObject(name)
+        self._compile_statements(body_nodes, block)
+        block.emit(RETURN)
+        return block
+
+    def _bound_names(self, statements):
+        """Yield the names a statement list binds with let, set or to, inside if/while blocks too."""
+        for statement in statements:
+            if isinstance(statement, (VarAssignNode, FuncDefNode)):
+                yield statement.name_token.value
+            elif isinstance(statement, SetNode) and isinstance(statement.target_node, VarAccessNode):
+                yield statement.target_node.name_token.value
+            elif isinstance(statement, IfNode):
+                for _, case_statements in statement.cases:
+                    yield from self._bound_names(case_statements)
+                if statement.else_case:
+                    yield from self._bound_names(statement.else_case)
+            elif isinstance(statement, WhileNode):
+                yield from self._bound_names(statement.body_nodes)
+
+    def _compile(self, node, block):
+        method = getattr(self, f'_compile_{type(node).__name__}', None)
+        if method is None:
+            # No opcode for this node: the Interpreter evaluates it in place
+            self._emit_eval(node, block)
+        else:
+            method(node, block)
+
+    def _emit_eval(self, node, block):
+        if block.slot_index is not None:
+            raise _NeedsSymbolTable()
+        block.emit(EVAL_NODE, block.add_const(node))
+
+    def _emit_store(self, name, name_op, local_op, block):
+        if block.slot_index is None:
+            block.emit(name_op, block.add_const(name))
+        elif name in block.slot_index:
+            block.emit(local_op, block.slot_index[name])
+        else:
+            raise _NeedsSymbolTable()
+
+    def _compile_statements(self, statements, block):
+        """Leave the last statement's value (Number(0) if falsy or none ran) on the stack."""
+        if not statements:
+            block.emit(LOAD_CONST, block.add_const(Number(0)))
+            return
+        for i, statement in enumerate(statements):
+            if i:
+                block.emit(POP)
+            self._compile(statement, block)
+        block.emit(TRUTHY_OR_ZERO)
+
+    def _emit_literal(self, value, token, block):
+        index = block.add_const(value)
+        if token.line and token.column:
+            block.positions[block.emit(LOAD_LITERAL, index)] = (token.line, token.column)
+        else:
+            block.emit(LOAD_CONST, index)
+
+    def _compile_NumberNode(self, node, block):
+        self._emit_literal(Number(node.value), node.token, block)
+
+    def _compile_StringNode(self, node, block):
+        self._emit_literal(String(node.value), node.token, block)
+
+    def _compile_VarAccessNode(self, node, block):
+        name = node.name_token.value
+        if block.slot_index is None:
+            pc = block.emit(LOAD_NAME, block.add_const(name))
+        elif name in block.slot_index:
+            pc = block.emit(LOAD_LOCAL, block.slot_index[name])
+        else:
+            block.global_caches.append([-1, None])
+            pc = block.emit(LOAD_GLOBAL, block.add_const(name), len(block.global_caches) - 1)
+        block.sources[pc + 1] = node
+
+    def _compile_VarAssignNode(self, node, block):
+        self._compile(node.value_node, block)
+        self._emit_store(node.name_token.value, STORE_NAME, STORE_LOCAL, block)
+
+    def _compile_SetNode(self, node, block):
+        if not isinstance(node.target_node, VarAccessNode):
+            self._emit_eval(node, block)
+            return
+        self._compile(node.value_node, block)
+        self._emit_store(node.target_node.name_token.value, SET_NAME, SET_LOCAL, block)
+
+    def _compile_BinOpNode(self, node, block):
+        op = node.op_token.value
+        if op == 'is an':
+            # The right side names a type and is never evaluated
+            right = node.right_node
+            type_name = None
+            if isinstance(right, TypeNameNode):
+                type_name = right.type_token.value
+            elif isinstance(right, VarAccessNode):
+                type_name = right.name_token.value
+            self._compile(node.left_node, block)
+            block.emit(IS_RESULT_TYPE, block.add_const(type_name if type_name in ('Error', 'Ok') else None))
+            return
+
+        opcode = self.BINARY_OPS.get(op)
+        if opcode is None:
+            # 'or return error' and unsupported operators keep the Interpreter's handling
+            self._emit_eval(node, block)
+            return
+        left, right = node.left_node, node.right_node
+        if isinstance(left, VarAccessNode) and self._emit_superinstruction(opcode, left, right, block):
+            return
+        self._compile(left, block)
+        self._compile(right, block)
+        block.emit(opcode)
+
+    def _emit_superinstruction(self, opcode, left, right, block):
+        """Emit a fused form of `left <opcode> right`; returns False if there is none."""
+        # Variables are fused by name in SymbolTable code and by slot in
+        # slot-compiled code, where free variables are left unfused
+        slots = block.slot_index
+        if slots is None:
+            const_ops = self.CONST_SUPERINSTRUCTIONS
+            add_op = LOAD_NAME_LOAD_NAME_ADD
+            operand = lambda var: block.add_const(var.name_token.value)
+        elif left.name_token.value in slots:
+            const_ops = self.LOCAL_CONST_SUPERINSTRUCTIONS
+            add_op = LOAD_LOCAL_LOAD_LOCAL_ADD
+            operand = lambda var: slots[var.name_token.value]
+        else:
+            return False
+
+        if isinstance(right, NumberNode):
+            fused = const_ops.get(opcode)
+            token = right.token
+            # The fused literal still becomes the frame's location, so it needs one
+            if fused is None or not (token.line and token.column):
+                return False
+            pc = block.emit(fused, operand(left), block.add_const(right.value))
+            block.positions[pc] = (token.line, token.column)
+        elif (isinstance(right, VarAccessNode) and opcode == BINOP_ADD
+              and (slots is None or right.name_token.value in slots)):
+            pc = block.emit(add_op, operand(left), operand(right))
+            block.sources[pc + 2] = right
+        else:
+            return False
+        block.sources[pc + 1] = left
+        return True
+
+    def _compile_UnaryOpNode(self, node, block):
+        if node.op_token.value != 'not':
+            self._emit_eval(node, block)
+            return
+        self._compile(node.node, block)
+        block.emit(UNARY_NOT)
+
+    def _compile_FuncDefNode(self, node, block):
+        name = node.name_token.value
+        arg_names = [p.value for p in node.param_tokens]
+        try:
+            code = self.compile_function(name, node.body_nodes, arg_names)
+        except CompileError:
+            code = False
+        block.emit(MAKE_FUNC, block.add_const((name, node.body_nodes, arg_names, code)))
+        self._emit_store(name, STORE_NAME, STORE_LOCAL, block)
+
+    def _compile_FuncCallNode(self, node, block):
+        if isinstance(node.node_to_call, MemberAccessNode):
+            # Method calls bind 'self' through the Interpreter
+            self._emit_eval(node, block)
+            return
+        # Arguments are evaluated before the callee, as in the Interpreter
+        for arg_node in node.arg_nodes:
+            self._compile(arg_node, block)
+        self._compile(node.node_to_call, block)
+        block.emit(CALL, len(node.arg_nodes))
+
+    def _compile_ReturnNode(self, node, block):
+        if node.node_to_return:
+            self._compile(node.node_to_return, block)
+        else:
+            block.emit(LOAD_CONST, block.add_const(Number(0)))
+        block.emit(RETURN)
+
+    def _compile_IfNode(self, node, block):
+        end_jumps = []
+        for condition_node, statements in node.cases:
+            self._compile(condition_node, block)
+            skip = block.emit(JUMP_IF_FALSE, -1)
+            self._compile_statements(statements, block)
+            end_jumps.append(block.emit(JUMP, -1))
+            block.patch_jump(skip)
+        self._compile_statements(node.else_case, block)
+        for jump in end_jumps:
+            block.patch_jump(jump)
+
+    def _compile_WhileNode(self, node, block):
+        # The loop's value is its last statement's, or Number(0) if the body never ran
+        block.emit(LOAD_CONST, block.add_const(Number(0)))
+        start = len(block.code)
+        self._compile(node.condition_node, block)
+        exit_jump = block.emit(JUMP_IF_FALSE, -1)
+        for statement in node.body_nodes:
+            block.emit(POP)
+            self._compile(statement, block)
+        block.emit(JUMP, start)
+        block.patch_jump(exit_jump)
+
+    def _compile_YieldNode(self, node, block):
+        # Yields outside a fiber unwind enclosing blocks like a return; leave them to the Interpreter
+        raise CompileError("yield outside a fiber")
+
+
+class VM:
+    """Runs compiled Engage code in a single dispatch loop."""
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.compiler = Compiler()
+        # Every name bound by a slot-compiled function this VM has called.
+        # Scoping is dynamic (a call sees its callers' variables), so
+        # LOAD_GLOBAL may only skip the call chain for a name no live call
+        # can bind; names outside this set never are.
+        self.slot_bound_names = set()
+        self._slot_code_seen = set()
+
+    def _function_code(self, func):
+        """Compile a Function made outside the VM (e.g. a record method) on its first call."""
+        try:
+            func.code = self.compiler.compile_function(func.name, func.body_node, func.arg_names)
+        except CompileError:
+            func.code = False
+        return func.code
+
+    def _unbound_local(self, block, operand_pc, scope):
+        """Value for a local slot that is still unset, found in the callers' scopes as SymbolTable.get would."""
+        node = block.sources[operand_pc]
+        value = scope.parent.get(node.name_token.value) if scope.parent else None
+        if value is None:
+            # Raises the Interpreter's NameError, suggestions included
+            self.interpreter.visit_VarAccessNode(node, scope)
+        return value
+
+    def run(self, program, symbol_table):
+        """
+        Run a compiled program.
+
+        Mirrors Interpreter.visit_ProgramNode: a runtime error abandons the
+        current top-level statement, is reported, and execution continues
+        with the next one. Call frames are pushed on the interpreter's stack
+        trace exactly as execute_user_function does.
+
+        Args:
+            program: CodeObject from Compiler.compile_program
+            symbol_table: Global SymbolTable to run in
+
+        Returns:
+            The value of the last top-level statement, or of a top-level return
+        """
+        interpreter = self.interpreter
+        stack_trace = interpreter.stack_trace
+        frames = stack_trace.frames
+        statement_starts = program.statement_starts
+        global_get = symbol_table.get
+        slot_bound_names = self.slot_bound_names
+        slot_code_seen = self._slot_code_seen
+        result = None
+        error_count = 0
+        pc = 0
+
+        while True:
+            # (Re)start at top level; an error unwinds every active call
+            block = program
+            code = block.code
+            consts = block.consts
+            context = symbol_table
+            values = None  # The current call's slots, if it is slot-compiled
+            stack = []
+            push = stack.append
+            pop = stack.pop
+            calls = []
+            # Calls whose variables live in SymbolTables can bind any name,
+            # so while one is active LOAD_GLOBAL walks the whole chain
+            dynamic_scopes = 0
+            # Literals update the location of the frame on top of the stack
+            # trace; the VM records only the last one and writes it out
+            # before anything can observe the frame
+            trace_frame = frames[-1] if frames else None
+            loc = -1
+
+            try:
+                while True:
+                    op = code[pc]
+                    if op == LOAD_NAME:
+                        value = context.get(consts[code[pc + 1]])
+                        if value is None:
+                            # Raises the Interpreter's NameError, suggestions included
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        push(value)
+                        pc += 2
+                    elif op == LOAD_LOCAL:
+                        value = values[code[pc + 1]]
+                        if value is None:
+                            value = self._unbound_local(block, pc + 1, context)
+                        push(value)
+                        pc += 2
+                    elif op == LOAD_LOCAL_SUB_CONST:
+                        left = values[code[pc + 1]]
+                        if left is None:
+                            left = self._unbound_local(block, pc + 1, context)
+                        loc = pc
+                        push(Number(left.value - consts[code[pc + 2]]))
+                        pc += 3
+                    elif op == LOAD_LOCAL_ADD_CONST:
+                        left = values[code[pc + 1]]
+                        if left is None:
+                            left = self._unbound_local(block, pc + 1, context)
+                        loc = pc
+                        if isinstance(left, String):
+                            push(String(str(left.value) + str(consts[code[pc + 2]])))
+                        else:
+                            push(Number(left.value + consts[code[pc + 2]]))
+                        pc += 3
+                    elif op == LOAD_LOCAL_LT_CONST:
+                        left = values[code[pc + 1]]
+                        if left is None:
+                            left = self._unbound_local(block, pc + 1, context)
+                        loc = pc
+                        push(Number(1) if left.value < consts[code[pc + 2]] else Number(0))
+                        pc += 3
+                    elif op == LOAD_LOCAL_LOAD_LOCAL_ADD:
+                        left = values[code[pc + 1]]
+                        if left is None:
+                            left = self._unbound_local(block, pc + 1, context)
+                        right = values[code[pc + 2]]
+                        if right is None:
+                            right = self._unbound_local(block, pc + 2, context)
+                        if isinstance(left, String) or isinstance(right, String):
+                            push(String(str(left.value) + str(right.value)))
+                        else:
+                            push(Number(left.value + right.value))
+                        pc += 3
+                    elif op == STORE_LOCAL:
+                        values[code[pc + 1]] = stack[-1]
+                        pc += 2
+                    elif op == LOAD_GLOBAL:
+                        name = consts[code[pc + 1]]
+                        if dynamic_scopes or name in slot_bound_names:
+                            value = context.get(name)
+                        else:
+                            # A root global table is the whole lookup chain,
+                            # so its version says whether the cached value is current
+                            cache = block.global_caches[code[pc + 2]]
+                            if cache[0] == symbol_table.version:
+                                value = cache[1]
+                            else:
+                                value = global_get(name)
+                                if symbol_table.parent is None:
+                                    cache[0] = symbol_table.version
+                                    cache[1] = value
+                        if value is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        push(value)
+                        pc += 3
+                    elif op == LOAD_NAME_SUB_CONST:
+                        left = context.get(consts[code[pc + 1]])
+                        if left is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        loc = pc
+                        push(Number(left.value - consts[code[pc + 2]]))
+                        pc += 3
+                    elif op == LOAD_NAME_ADD_CONST:
+                        left = context.get(consts[code[pc + 1]])
+                        if left is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        loc = pc
+                        if isinstance(left, String):
+                            push(String(str(left.value) + str(consts[code[pc + 2]])))
+                        else:
+                            push(Number(left.value + consts[code[pc + 2]]))
+                        pc += 3
+                    elif op == LOAD_NAME_LT_CONST:
+                        left = context.get(consts[code[pc + 1]])
+                        if left is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        loc = pc
+                        push(Number(1) if left.value < consts[code[pc + 2]] else Number(0))
+                        pc += 3
+                    elif op == LOAD_NAME_LOAD_NAME_ADD:
+                        left = context.get(consts[code[pc + 1]])
+                        if left is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        right = context.get(consts[code[pc + 2]])
+                        if right is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 2], context)
+                        if isinstance(left, String) or isinstance(right, String):
+                            push(String(str(left.value) + str(right.value)))
+                        else:
+                            push(Number(left.value + right.value))
+                        pc += 3
+                    elif op == LOAD_NAME_MUL_CONST:
+                        left = context.get(consts[code[pc + 1]])
+                        if left is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        loc = pc
+                        push(Number(left.value * consts[code[pc + 2]]))
+                        pc += 3
+                    elif op == LOAD_NAME_GT_CONST:
+                        left = context.get(consts[code[pc + 1]])
+                        if left is None:
+                            interpreter.visit_VarAccessNode(block.sources[pc + 1], context)
+                        loc = pc
+                        push(Number(1) if left.value > consts[code[pc + 2]] else Number(0))
+                        pc += 3
+                    elif op == LOAD_LITERAL:
+                        push(consts[code[pc + 1]])
+                        loc = pc
+                        pc += 2
+                    elif op == LOAD_CONST:
+                        push(consts[code[pc + 1]])
+                        pc += 2
+                    elif op == STORE_NAME:
+                        context.set(consts[code[pc + 1]], stack[-1])
+                        pc += 2
+                    elif op == POP:
+                        pop()
+                        pc += 1
+                    elif op == JUMP_IF_FALSE:
+                        if pop().is_true():
+                            pc += 2
+                        else:
+                            pc = code[pc + 1]
+                    elif op == JUMP:
+                        pc = code[pc + 1]
+                    elif op == BINOP_ADD:
+                        right = pop()
+                        left = stack[-1]
+                        if isinstance(left, String) or isinstance(right, String):
+                            stack[-1] = String(str(left.value) + str(right.value))
+                        else:
+                            stack[-1] = Number(left.value + right.value)
+                        pc += 1
+                    elif op == BINOP_SUB:
+                        right = pop()
+                        stack[-1] = Number(stack[-1].value - right.value)
+                        pc += 1
+                    elif op == BINOP_MUL:
+                        right = pop()
+                        stack[-1] = Number(stack[-1].value * right.value)
+                        pc += 1
+                    elif op == BINOP_DIV:
+                        right = pop()
+                        if right.value == 0:
+                            raise ZeroDivisionError("Division by zero")
+                        stack[-1] = Number(stack[-1].value / right.value)
+                        pc += 1
+                    elif op == CMP_LT:
+                        right = pop()
+                        stack[-1] = Number(1) if stack[-1].value < right.value else Number(0)
+                        pc += 1
+                    elif op == CMP_GT:
+                        right = pop()
+                        stack[-1] = Number(1) if stack[-1].value > right.value else Number(0)
+                        pc += 1
+                    elif op == CMP_EQ:
+                        right = pop()
+                        stack[-1] = Number(1) if stack[-1].value == right.value else Number(0)
+                        pc += 1
+                    elif op == CMP_NE:
+                        right = pop()
+                        stack[-1] = Number(1) if stack[-1].value != right.value else Number(0)
+                        pc += 1
+                    elif op == CALL:
+                        argc = code[pc + 1]
+                        pc += 2
+                        callee = pop()
+                        if argc:
+                            args = stack[-argc:]
+                            del stack[-argc:]
+                        else:
+                            args = []
+                        if loc >= 0 and trace_frame is not None:
+                            trace_frame.update_location(*block.positions[loc])
+                        loc = -1
+
+                        if isinstance(callee, Function):
+                            if argc != callee.n_args:
+                                raise TypeError(f"Function '{callee.name}' takes {callee.n_args} arguments but {argc} were given")
+                            func_code = callee.code
+                            if func_code is None:
+                                func_code = self._function_code(callee)
+                            if func_code is False:
+                                push(interpreter.execute_user_function(callee, args, context))
+                                continue
+
+                            local_names = func_code.local_names
+                            if local_names is not None:
+                                if func_code not in slot_code_seen:
+                                    slot_code_seen.add(func_code)
+                                    slot_bound_names.update(local_names)
+                                # Arguments fill the leading slots
+                                func_values = args
+                                if len(local_names) > argc:
+                                    func_values += [None] * (len(local_names) - argc)
+                                func_context = LocalScope(func_values, func_code.slot_index, context)
+                            else:
+                                func_values = None
+                                func_context = SymbolTable(parent=context)
+                                callee.bind(func_context.symbols, args)
+                            frame = stack_trace.push_frame(
+                                function_name=callee.name,
+                                file_path=interpreter.file_path,
+                                context=func_context
+                            )
+                            if not frame:
+                                # Stack overflow protection
+                                raise RuntimeError("Maximum call stack depth exceeded")
+
+                            calls.append((block, pc, stack, context, values, trace_frame))
+                            block = func_code
+                            code = block.code
+                            consts = block.consts
+                            stack = []
+                            push = stack.append
+                            pop = stack.pop
+                            context = func_context
+                            values = func_values
+                            if values is None:
+                                dynamic_scopes += 1
+                            trace_frame = frame
+                            pc = 0
+                        elif isinstance(callee, BoundMethod):
+                            push(interpreter.execute_user_function(callee.method, args, context, callee.instance))
+                        elif isinstance(callee, BuiltInFunction):
+                            push(callee.func_ptr(args))
+                        else:
+                            raise TypeError(f"'{callee}' is not a function")
+                    elif op == RETURN:
+                        value = pop()
+                        if not calls:
+                            # 'return' at top level ends the program
+                            return value
+                        stack_trace.pop_frame()
+                        if values is None:
+                            dynamic_scopes -= 1
+                        block, pc, stack, context, values, trace_frame = calls.pop()
+                        code = block.code
+                        consts = block.consts
+                        push = stack.append
+                        pop = stack.pop
+                        push(value)
+                        loc = -1
+                    elif op == TRUTHY_OR_ZERO:
+                        if not stack[-1]:
+                            stack[-1] = Number(0)
+                        pc += 1
+                    elif op == SET_LOCAL:
+                        slot = code[pc + 1]
+                        if values[slot] is None and context.get(block.local_names[slot]) is None:
+                            raise NameError(f"Cannot 'set' variable '{block.local_names[slot]}' before it is declared with 'let'.")
+                        values[slot] = stack[-1]
+                        pc += 2
+                    elif op == LOAD_LOCAL_MUL_CONST:
+                        left = values[code[pc + 1]]
+                        if left is None:
+                            left = self._unbound_local(block, pc + 1, context)
+                        loc = pc
+                        push(Number(left.value * consts[code[pc + 2]]))
+                        pc += 3
+                    elif op == LOAD_LOCAL_GT_CONST:
+                        left = values[code[pc + 1]]
+                        if left is None:
+                            left = self._unbound_local(block, pc + 1, context)
+                        loc = pc
+                        push(Number(1) if left.value > consts[code[pc + 2]] else Number(0))
+                        pc += 3
+                    elif op == SET_NAME:
+                        name = consts[code[pc + 1]]
+                        if context.get(name) is None:
+                            raise NameError(f"Cannot 'set' variable '{name}' before it is declared with 'let'.")
+                        context.set(name, stack[-1])
+                        pc += 2
+                    elif op == BINOP_AND:
+                        right = pop()
+                        stack[-1] = Number(1) if stack[-1].is_true() and right.is_true() else Number(0)
+                        pc += 1
+                    elif op == BINOP_OR:
+                        right = pop()
+                        stack[-1] = Number(1) if stack[-1].is_true() or right.is_true() else Number(0)
+                        pc += 1
+                    elif op == UNARY_NOT:
+                        stack[-1] = Number(0) if stack[-1].is_true() else Number(1)
+                        pc += 1
+                    elif op == IS_RESULT_TYPE:
+                        type_name = consts[code[pc + 1]]
+                        value = stack[-1]
+                        is_type = type_name is not None and isinstance(value, ResultValue) and value.type == type_name
+                        stack[-1] = Number(1) if is_type else Number(0)
+                        pc += 2
+                    elif op == EVAL_NODE:
+                        if loc >= 0 and trace_frame is not None:
+                            trace_frame.update_location(*block.positions[loc])
+                        loc = -1
+                        push(interpreter.visit(consts[code[pc + 1]], context))
+                        pc += 2
+                    elif op == MAKE_FUNC:
+                        name, body_nodes, arg_names, func_code = consts[code[pc + 1]]
+                        func = Function(name, body_nodes, arg_names)
+                        func.code = func_code
+                        push(func)
+                        pc += 2
+                    elif op == STORE_RESULT:
+                        result = pop()
+                        pc += 1
+                    elif op == HALT:
+                        return result
+                    else:
+                        raise RuntimeError(f"Unknown opcode {op} at {block.name}:{pc}")
+            except Exception as e:
+                if loc >= 0 and trace_frame is not None:
+                    trace_frame.update_location(*block.positions[loc])
+                if not isinstance(e, EngageRuntimeError):
+                    e = interpreter._wrap_runtime_error(e)
+                error_count += 1
+                if interpreter._report_runtime_error(e, error_count):
+                    return result
+
+                # Continue with the top-level statement after the one that failed
+                top_pc = calls[0][1] if calls else pc
+                next_statement = bisect_right(statement_starts, top_pc)
+                if next_statement < len(statement_starts):
+                    pc = statement_starts[next_statement]
+                else:
+                    pc = len(program.code) - 1
@@ -1,8 +1,118 @@
 # engage_errors.py
 # Enhanced error reporting system for the Engage programming language
 
+import os
 import re
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, islice
+from typing import List, Optional, Dict, Any, Iterator
+
+# Optional C++ edit-distance backend for spell checking
+try:
+    from rapidfuzz import process as rapidfuzz_process
+    from rapidfuzz.distance import Levenshtein as RapidfuzzLevenshtein
+    from rapidfuzz.distance import DamerauLevenshtein as RapidfuzzDamerauLevenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    rapidfuzz_process = None
+    RapidfuzzLevenshtein = None
+    RapidfuzzDamerauLevenshtein = None
+
+# Optional compiled kernel built from engage_errors_accel.pyx
+try:
+    from engage_errors_accel import levenshtein as accel_levenshtein
+    ACCEL_AVAILABLE = True
+except ImportError:
+    ACCEL_AVAILABLE = False
+    accel_levenshtein = None
+
+# Pure-Python fallbacks, kept in their own module so they can be compiled
+# ahead of time with mypyc
+import engage_suggest_core
+from engage_suggest_core import (
+    is_transposition as core_is_transposition,
+    levenshtein as core_levenshtein,
+)
+
+# Whether engage_suggest_core was loaded as a mypyc extension rather than source
+CORE_COMPILED = not engage_suggest_core.__file__.endswith('.py')
+
+def _import_numpy():
+    """Import numpy on first use (rapidfuzz's batch scorer needs it); None if missing."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+# Optional JIT backend for the edit-distance fallback when rapidfuzz, the Cython
+# kernel and a compiled engage_suggest_core are all absent.
+# numba is slow to import, so it is only loaded the first time it is needed.
+_jit_levenshtein = None
+_numba_checked = False
+
+def _get_levenshtein_kernel():
+    """Return the numba-compiled Levenshtein kernel, or None if numba is unavailable."""
+    global _jit_levenshtein, _numba_checked
+    if _numba_checked:
+        return _jit_levenshtein
+    _numba_checked = True
+    
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True)
+    def levenshtein_kernel(a, b):
+        """Two-row Levenshtein DP over code point arrays (nopython mode)."""
+        if a.shape[0] < b.shape[0]:
+            a, b = b, a
+        n = b.shape[0]
+        # Two preallocated int32 rows, swapped by reference after each pass
+        previous_row = np.empty(n + 1, dtype=np.int32)
+        current_row = np.empty(n + 1, dtype=np.int32)
+        for j in range(n + 1):
+            previous_row[j] = j
+        for i in range(a.shape[0]):
+            current_row[0] = i + 1
+            c1 = a[i]
+            for j in range(n):
+                # Explicit compares instead of min() compile to branch-free selects
+                cost = previous_row[j] + (1 if c1 != b[j] else 0)
+                insertion = previous_row[j + 1] + 1
+                deletion = current_row[j] + 1
+                if insertion < cost:
+                    cost = insertion
+                if deletion < cost:
+                    cost = deletion
+                current_row[j + 1] = cost
+            previous_row, current_row = current_row, previous_row
+        return previous_row[n]
+    
+    def levenshtein(s1: str, s2: str) -> int:
+        # UTF-32 code points, so non-ASCII identifiers match the pure-Python result
+        return int(levenshtein_kernel(np.frombuffer(s1.encode('utf-32-le'), dtype=np.uint32),
+                                      np.frombuffer(s2.encode('utf-32-le'), dtype=np.uint32)))
+    
+    _jit_levenshtein = levenshtein
+    return _jit_levenshtein
+
+# Shared padding for error pointer lines; slicing it avoids building a new
+# run of spaces for every formatted error
+_SPACE_BUFFER = " " * 8192
+
+
+@dataclass(slots=True)
+class ContextBlock:
+    """Source lines around an error, stored as parallel columns."""
+    line_numbers: range
+    contents: List[str]
+    error_index: int  # Position of the error line in the block, or -1
+
 
 class EngageError:
     """
@@ -11,6 +121,9 @@ class EngageError:
     and helpful suggestions for common mistakes.
     """
     
+    __slots__ = ('message', 'line', 'column', 'file_path', 'error_type',
+                 'source_lines', 'suggestions', '_suggestion_set', '_format_cache')
+    
     def __init__(self, 
                  message: str, 
                  line: int, 
@@ -38,15 +151,21 @@ class EngageError:
         self.error_type = error_type
         self.source_lines = source_lines or []
         self.suggestions = suggestions or []
+        self._suggestion_set = set(self.suggestions)
+        self._format_cache: Dict[tuple, str] = {}
         
     def add_suggestion(self, suggestion: str):
         """Add a suggestion to help fix the error."""
-        if suggestion not in self.suggestions:
-            self.suggestions.append(suggestion)
+        if suggestion in self._suggestion_set:
+            return
+        self._suggestion_set.add(suggestion)
+        self.suggestions.append(suggestion)
+        self._format_cache.clear()
     
     def set_source_context(self, source_lines: List[str]):
         """Set the source code lines for context display."""
         self.source_lines = source_lines
+        self._format_cache.clear()
     
     def get_context_lines(self, context_size: int = 2) -> List[tuple]:
         """
@@ -63,62 +182,109 @@ class EngageError:
         
         start_line = max(1, self.line - context_size)
         end_line = min(len(self.source_lines), self.line + context_size)
+        if end_line < start_line:
+            return []
+        error_line = self.line
+        
+        return [(line_num, line_content, line_num == error_line)
+                for line_num, line_content in enumerate(self.source_lines[start_line - 1:end_line],
+                                                        start=start_line)]
+    
+    def get_context_block(self, context_size: int = 2) -> ContextBlock:
+        """
+        Get source lines around the error as a ContextBlock.
+        
+        Same lines as get_context_lines, without building a tuple per line.
         
-        context_lines = []
-        for line_num in range(start_line, end_line + 1):
-            if line_num <= len(self.source_lines):
-                line_content = self.source_lines[line_num - 1]
-                is_error_line = (line_num == self.line)
-                context_lines.append((line_num, line_content, is_error_line))
+        Args:
+            context_size: Number of lines to show before and after error line
+            
+        Returns:
+            ContextBlock with line numbers, contents and the error line's index
+        """
+        start_line = max(1, self.line - context_size)
+        end_line = max(min(len(self.source_lines), self.line + context_size), start_line - 1)
+        line_numbers = range(start_line, end_line + 1)
+        error_index = self.line - start_line if self.line in line_numbers else -1
         
-        return context_lines
+        return ContextBlock(line_numbers, self.source_lines[start_line - 1:end_line], error_index)
     
-    def format_error(self, show_context: bool = True, show_suggestions: bool = True) -> str:
+    def format_error(self, show_context: bool = True, show_suggestions: bool = True,
+                     indent: str = "") -> str:
         """
         Format the error as a comprehensive, user-friendly message.
         
         Args:
             show_context: Whether to include source code context
             show_suggestions: Whether to include suggestions
+            indent: Prefix added to every line of the message
             
         Returns:
             Formatted error message string
         """
-        lines = []
+        # Every field the text shows can be written directly (the aggregator
+        # fills in file_path), so they are all part of the key; add_suggestion
+        # and set_source_context clear the cache
+        cache_key = (show_context, show_suggestions, indent, self.message, self.line,
+                     self.column, self.file_path, self.error_type)
+        cached = self._format_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        context = self.get_context_block() if show_context and self.source_lines else None
+        suggestions = self.suggestions if show_suggestions else None
+        
+        # Size the line list up front; blank separator lines are left as ""
+        line_count = 2
+        if context is not None:
+            line_count += 1 + len(context.contents) + (1 if context.error_index >= 0 else 0)
+        if suggestions:
+            line_count += 2 + len(suggestions)
+        lines = [""] * line_count
         
         # Header with file and location
         if self.file_path:
-            lines.append(f"{self.error_type} in {self.file_path}:")
+            lines[0] = f"{self.error_type} in {self.file_path}:"
         else:
-            lines.append(f"{self.error_type}:")
+            lines[0] = f"{self.error_type}:"
         
         # Main error message with location
-        lines.append(f"  Line {self.line}, Column {self.column}: {self.message}")
+        lines[1] = f"  Line {self.line}, Column {self.column}: {self.message}"
+        pos = 2
         
         # Source code context
-        if show_context and self.source_lines:
-            lines.append("")
-            context_lines = self.get_context_lines()
+        if context is not None:
+            pos += 1
+            error_index = context.error_index
             
-            for line_num, line_content, is_error_line in context_lines:
+            for index, (line_num, line_content) in enumerate(zip(context.line_numbers, context.contents)):
                 # Line number and content
+                is_error_line = index == error_index
                 prefix = ">>> " if is_error_line else "    "
-                lines.append(f"{prefix}{line_num:3d} | {line_content}")
+                lines[pos] = f"{prefix}{line_num:3d} | {line_content}"
+                pos += 1
                 
                 # Error pointer for the error line
                 if is_error_line:
-                    pointer_line = "    " + " " * 4  # Account for line number formatting
-                    pointer_line += " " * (self.column - 1) + "^"
-                    lines.append(pointer_line)
+                    # 8 columns for the prefix and line number, then the column offset
+                    pad_width = 8 + max(self.column - 1, 0)
+                    if pad_width <= len(_SPACE_BUFFER):
+                        lines[pos] = _SPACE_BUFFER[:pad_width] + "^"
+                    else:
+                        lines[pos] = " " * pad_width + "^"
+                    pos += 1
         
         # Suggestions
-        if show_suggestions and self.suggestions:
-            lines.append("")
-            lines.append("Suggestions:")
-            for suggestion in self.suggestions:
-                lines.append(f"  • {suggestion}")
-        
-        return "\n".join(lines)
+        if suggestions:
+            lines[pos + 1] = "Suggestions:"
+            pos += 2
+            for suggestion in suggestions:
+                lines[pos] = f"  • {suggestion}"
+                pos += 1
+        
+        formatted = indent + ("\n" + indent).join(lines)
+        self._format_cache[cache_key] = formatted
+        return formatted
     
     def __str__(self) -> str:
         """String representation of the error."""
@@ -218,25 +384,24 @@ class ErrorAggregator:
         if not self.errors:
             return "No errors found."
         
-        lines = []
+        # Two summary lines, two lines per error and three separator lines
+        # between errors; blank lines are left as ""
+        error_count = len(self.errors)
+        lines = [""] * (2 + 2 * error_count + 3 * (error_count - 1))
         
         # Summary
-        error_count = len(self.errors)
-        lines.append(f"Found {error_count} error{'s' if error_count != 1 else ''}:")
-        lines.append("")
+        lines[0] = f"Found {error_count} error{'s' if error_count != 1 else ''}:"
+        pos = 2
         
         # Individual errors
         for i, error in enumerate(self.errors, 1):
-            lines.append(f"Error {i}:")
-            error_text = error.format_error(show_context, show_suggestions)
-            # Indent the error text
-            indented_lines = ["  " + line for line in error_text.split("\n")]
-            lines.extend(indented_lines)
+            lines[pos] = f"Error {i}:"
+            lines[pos + 1] = error.format_error(show_context, show_suggestions, indent="  ")
+            pos += 2
             
-            if i < len(self.errors):  # Add separator between errors
-                lines.append("")
-                lines.append("-" * 50)
-                lines.append("")
+            if i < error_count:  # Add separator between errors
+                lines[pos + 1] = "-" * 50
+                pos += 3
         
         return "\n".join(lines)
     
@@ -245,6 +410,13 @@ class ErrorAggregator:
         return self.format_all_errors()
 
 
+@lru_cache(maxsize=64)
+def _read_source_lines(file_path: str, mtime_ns: int, size: int) -> tuple:
+    """Read a source file's lines; the stat values key the cache so edits are picked up."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return tuple(f.read().splitlines())
+
+
 class SourceContextExtractor:
     """
     Utility class for extracting source code context around errors.
@@ -276,8 +448,8 @@ class SourceContextExtractor:
             List of source lines, or empty list if file cannot be read
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read().splitlines()
+            stat = os.stat(file_path)
+            return list(_read_source_lines(file_path, stat.st_mtime_ns, stat.st_size))
         except (IOError, OSError, UnicodeDecodeError):
             return []
     
@@ -302,14 +474,9 @@ class SourceContextExtractor:
         start_line = max(1, line_number - context_size)
         end_line = min(len(source_lines), line_number + context_size)
         
-        context_lines = []
-        for line_num in range(start_line, end_line + 1):
-            if line_num <= len(source_lines):
-                line_content = self.source_lines[line_num - 1]
-                is_target_line = (line_num == line_number)
-                context_lines.append((line_num, line_content, is_error_line))
-        
-        return context_lines
+        return [(line_num, line_content, line_num == line_number)
+                for line_num, line_content in enumerate(source_lines[start_line - 1:end_line],
+                                                        start=start_line)]
 
 
 class ErrorSuggestionEngine:
@@ -339,10 +506,17 @@ class ErrorSuggestionEngine:
         'Vector': ['Vector', 'Array', 'List']
     }
     
+    # One pass over a message finds every keyword occurrence (the lookahead
+    # allows overlaps); the earliest-declared keyword found still wins
+    _KEYWORD_PATTERN = re.compile(
+        "(?=(" + "|".join(re.escape(keyword) for keyword in KEYWORD_SUGGESTIONS) + "))")
+    _KEYWORD_PRIORITY = {keyword: index for index, keyword in enumerate(KEYWORD_SUGGESTIONS)}
+    
     # Error message templates for common error types
     ERROR_TEMPLATES = {
         'undefined_variable': {
             'pattern': r"'(\w+)' is not defined",
+            'keyword': "is not defined",
             'template': "Variable '{name}' is not defined",
             'suggestions': [
                 "Check the spelling of the variable name",
@@ -352,6 +526,7 @@ class ErrorSuggestionEngine:
         },
         'undefined_function': {
             'pattern': r"'(\w+)' is not a function",
+            'keyword': "is not a function",
             'template': "'{name}' is not a function or is not defined",
             'suggestions': [
                 "Check the spelling of the function name",
@@ -361,6 +536,7 @@ class ErrorSuggestionEngine:
         },
         'division_by_zero': {
             'pattern': r"Division by zero",
+            'keyword': "Division by zero",
             'template': "Cannot divide by zero",
             'suggestions': [
                 "Check that the divisor is not zero before performing division",
@@ -370,6 +546,7 @@ class ErrorSuggestionEngine:
         },
         'type_mismatch': {
             'pattern': r"Unsupported operand types for (\w+)",
+            'keyword': "Unsupported operand types for ",
             'template': "Cannot perform operation '{operation}' on these types",
             'suggestions': [
                 "Check that both operands are the correct type for this operation",
@@ -379,6 +556,7 @@ class ErrorSuggestionEngine:
         },
         'invalid_index': {
             'pattern': r"Vector indices must be (integers|numbers)",
+            'keyword': "Vector indices must be ",
             'template': "Vector index must be a number (integer)",
             'suggestions': [
                 "Use a number for the vector index, like vector[0]",
@@ -388,6 +566,7 @@ class ErrorSuggestionEngine:
         },
         'invalid_key': {
             'pattern': r"Table keys must be strings",
+            'keyword': "Table keys must be strings",
             'template': "Table key must be a string",
             'suggestions': [
                 "Use double quotes around your table key, like table[\"key\"]",
@@ -397,6 +576,7 @@ class ErrorSuggestionEngine:
         },
         'missing_end': {
             'pattern': r"Expected 'end'",
+            'keyword': "Expected 'end'",
             'template': "Missing 'end' keyword to close block",
             'suggestions': [
                 "Add 'end' to close your if/while/function/record block",
@@ -406,6 +586,7 @@ class ErrorSuggestionEngine:
         },
         'missing_period': {
             'pattern': r"Expected period",
+            'keyword': "Expected period",
             'template': "Missing period (.) at end of statement",
             'suggestions': [
                 "Add a period (.) at the end of your statement",
@@ -415,6 +596,7 @@ class ErrorSuggestionEngine:
         },
         'wrong_argument_count': {
             'pattern': r"Function '(\w+)' takes (\d+) arguments but (\d+) were given",
+            'keyword': " arguments but ",
             'template': "Function '{name}' expects {expected} arguments but got {actual}",
             'suggestions': [
                 "Check the function definition to see how many parameters it expects",
@@ -424,6 +606,7 @@ class ErrorSuggestionEngine:
         },
         'cannot_convert': {
             'pattern': r"Cannot convert '(.+)' to number",
+            'keyword': "Cannot convert '",
             'template': "Cannot convert '{value}' to a number",
             'suggestions': [
                 "Check that the value contains only numeric characters",
@@ -433,14 +616,43 @@ class ErrorSuggestionEngine:
         }
     }
     
-    # Common built-in function names for spell checking
-    BUILTIN_FUNCTIONS = [
+    # Template patterns compiled once, in declaration order. Each template's
+    # 'keyword' is a literal that every match of its pattern contains, so a
+    # plain substring test rules out most templates before the regex runs.
+    _COMPILED_TEMPLATES = [
+        (template_info['keyword'], re.compile(template_info['pattern']), template_info['suggestions'])
+        for template_info in ERROR_TEMPLATES.values()
+    ]
+    
+    # Common built-in function names for spell checking, in suggestion order,
+    # plus a frozenset of the same names for membership tests
+    BUILTIN_FUNCTIONS_TUPLE = (
         'print', 'input', 'number', 'length', 'substring', 'split', 'join',
         'to_upper', 'to_lower', 'sqrt', 'pow', 'abs', 'min', 'max',
         'sin', 'cos', 'tan', 'read_file', 'write_file', 'file_exists',
         'create_directory', 'map', 'filter', 'reduce', 'sort',
         'type_of', 'is_number', 'is_string', 'is_table', 'is_vector'
-    ]
+    )
+    BUILTIN_FUNCTIONS = frozenset(BUILTIN_FUNCTIONS_TUPLE)
+    
+    # Common typos: missing/extra characters
+    COMMON_TYPOS = {
+        'lenght': 'length',
+        'widht': 'width',
+        'heigth': 'height',
+        'postion': 'position',
+        'positon': 'position',
+        'colum': 'column',
+        'columm': 'column',
+        'indx': 'index',
+        'idx': 'index',
+        'cnt': 'count',
+        'num': 'number',
+        'str': 'string',
+        'val': 'value',
+        'tmp': 'temp',
+        'usr': 'user'
+    }
     
     @staticmethod
     def suggest_for_undefined_variable(var_name: str, available_vars: List[str]) -> List[str]:
@@ -454,29 +666,42 @@ class ErrorSuggestionEngine:
         Returns:
             List of suggested variable names
         """
-        suggestions = []
+        # Limit to top 4 suggestions; later checks never run once 4 are found
+        return list(islice(
+            ErrorSuggestionEngine._iter_variable_suggestions(var_name, available_vars), 4))
+    
+    @staticmethod
+    def _iter_variable_suggestions(var_name: str, available_vars: List[str]) -> Iterator[str]:
+        """
+        Yield undefined-variable suggestions, best checks first.
+        
+        A capitalization-only mismatch is almost certainly the intended name,
+        so when one exists it preempts the spell-check and typo passes.
+        """
+        var_name_lower = var_name.lower()
         
         # Exact case-insensitive match
+        found_case_match = False
         for var in available_vars:
-            if var.lower() == var_name.lower() and var != var_name:
-                suggestions.append(f"Did you mean '{var}' (check capitalization)?")
+            if var.lower() == var_name_lower and var != var_name:
+                found_case_match = True
+                yield f"Did you mean '{var}' (check capitalization)?"
+        if found_case_match:
+            return
         
         # Enhanced spell checking with multiple algorithms
         close_matches = ErrorSuggestionEngine._enhanced_spell_check(var_name, available_vars)
         for match, reason in close_matches:
-            suggestions.append(f"Did you mean '{match}'? ({reason})")
+            yield f"Did you mean '{match}'? ({reason})"
         
         # Common variable naming patterns
         if '_' not in var_name and any('_' in var for var in available_vars):
             snake_case = var_name.replace(' ', '_').lower()
             if snake_case in available_vars:
-                suggestions.append(f"Did you mean '{snake_case}' (use underscores)?")
+                yield f"Did you mean '{snake_case}' (use underscores)?"
         
         # Check for common typos in variable names
-        typo_suggestions = ErrorSuggestionEngine._check_common_variable_typos(var_name, available_vars)
-        suggestions.extend(typo_suggestions)
-        
-        return suggestions[:4]  # Limit to top 4 suggestions
+        yield from ErrorSuggestionEngine._check_common_variable_typos(var_name, available_vars)
     
     @staticmethod
     def suggest_for_undefined_function(func_name: str, available_functions: List[str] = None) -> List[str]:
@@ -490,34 +715,52 @@ class ErrorSuggestionEngine:
         Returns:
             List of suggested function names
         """
-        suggestions = []
-        all_functions = (available_functions or []) + ErrorSuggestionEngine.BUILTIN_FUNCTIONS
+        # Limit to top 4 suggestions; later checks never run once 4 are found
+        suggestions = list(islice(
+            ErrorSuggestionEngine._iter_function_suggestions(func_name, available_functions), 4))
         
-        # Exact case-insensitive match
-        for func in all_functions:
-            if func.lower() == func_name.lower() and func != func_name:
-                suggestions.append(f"Did you mean '{func}' (check capitalization)?")
+        # Check for missing 'to' keyword in function definitions
+        if not suggestions:
+            suggestions.append("If you're trying to define a function, use 'to function_name:'")
+            suggestions.append("If you're trying to call a function, make sure it's defined first")
+        
+        return suggestions
+    
+    @staticmethod
+    def _iter_function_suggestions(func_name: str, available_functions: Optional[List[str]]) -> Iterator[str]:
+        """
+        Yield undefined-function suggestions, best checks first.
+        
+        A capitalization-only mismatch preempts the spell-check pass.
+        """
+        available_functions = available_functions or ()
+        builtin_functions = ErrorSuggestionEngine.BUILTIN_FUNCTIONS
+        func_name_lower = func_name.lower()
         
-        # Enhanced spell checking for functions
+        # Exact case-insensitive match
+        found_case_match = False
+        for func in chain(available_functions, ErrorSuggestionEngine.BUILTIN_FUNCTIONS_TUPLE):
+            if func.lower() == func_name_lower and func != func_name:
+                found_case_match = True
+                yield f"Did you mean '{func}' (check capitalization)?"
+        if found_case_match:
+            return
+        
+        # Enhanced spell checking for functions (needs several passes, so
+        # the candidates are only materialized here)
+        all_functions = [*available_functions, *ErrorSuggestionEngine.BUILTIN_FUNCTIONS_TUPLE]
         close_matches = ErrorSuggestionEngine._enhanced_spell_check(func_name, all_functions)
         for match, reason in close_matches:
-            if match in ErrorSuggestionEngine.BUILTIN_FUNCTIONS:
-                suggestions.append(f"Did you mean built-in function '{match}'? ({reason})")
+            if match in builtin_functions:
+                yield f"Did you mean built-in function '{match}'? ({reason})"
             else:
-                suggestions.append(f"Did you mean '{match}'? ({reason})")
+                yield f"Did you mean '{match}'? ({reason})"
         
         # Check for common function name patterns
         if func_name.endswith('_'):
             base_name = func_name[:-1]
-            if base_name in all_functions:
-                suggestions.append(f"Did you mean '{base_name}' (remove trailing underscore)?")
-        
-        # Check for missing 'to' keyword in function definitions
-        if not suggestions:
-            suggestions.append("If you're trying to define a function, use 'to function_name:'")
-            suggestions.append("If you're trying to call a function, make sure it's defined first")
-        
-        return suggestions[:4]  # Limit to top 4 suggestions
+            if base_name in builtin_functions or base_name in available_functions:
+                yield f"Did you mean '{base_name}' (remove trailing underscore)?"
     
     @staticmethod
     def suggest_for_syntax_error(error_message: str, context: str = "") -> List[str]:
@@ -555,11 +798,12 @@ class ErrorSuggestionEngine:
         
         # Keyword suggestions with enhanced spell checking
         if "expected keyword" in error_lower:
-            for keyword, alternatives in ErrorSuggestionEngine.KEYWORD_SUGGESTIONS.items():
-                if keyword in error_lower:
-                    alt_list = "', '".join(alternatives)
-                    suggestions.append(f"Did you mean one of: '{alt_list}'?")
-                    break
+            found_keywords = {match.group(1)
+                              for match in ErrorSuggestionEngine._KEYWORD_PATTERN.finditer(error_lower)}
+            if found_keywords:
+                keyword = min(found_keywords, key=ErrorSuggestionEngine._KEYWORD_PRIORITY.__getitem__)
+                alt_list = "', '".join(ErrorSuggestionEngine.KEYWORD_SUGGESTIONS[keyword])
+                suggestions.append(f"Did you mean one of: '{alt_list}'?")
         
         # Enhanced bracket/parentheses suggestions
         if "bracket" in error_lower or "parenthes" in error_lower:
@@ -639,15 +883,11 @@ class ErrorSuggestionEngine:
         Returns:
             List of suggestions from matching templates
         """
-        suggestions = []
-        
-        for template_name, template_info in ErrorSuggestionEngine.ERROR_TEMPLATES.items():
-            pattern = template_info['pattern']
-            if re.search(pattern, error_message):
-                suggestions.extend(template_info['suggestions'])
-                break  # Use first matching template
+        for keyword, pattern, suggestions in ErrorSuggestionEngine._COMPILED_TEMPLATES:
+            if keyword in error_message and pattern.search(error_message):
+                return list(suggestions)  # Use first matching template
         
-        return suggestions
+        return []
     
     @staticmethod
     def _enhanced_spell_check(target: str, candidates: List[str], max_distance: int = 3) -> List[tuple]:
@@ -663,10 +903,17 @@ class ErrorSuggestionEngine:
             List of tuples (match, reason) sorted by relevance
         """
         matches = []
+        target_len = len(target)
+        target_lower = target.lower()
+        
+        # Candidates whose length differs by more than max_distance can never
+        # be within max_distance edits, so skip the DP for them entirely
+        within_reach = [candidate for candidate in candidates
+                        if abs(len(candidate) - target_len) <= max_distance]
         
         # Levenshtein distance matches
-        for candidate in candidates:
-            distance = ErrorSuggestionEngine._levenshtein_distance(target, candidate)
+        distances = ErrorSuggestionEngine._batch_levenshtein(target, within_reach, max_distance)
+        for candidate, distance in zip(within_reach, distances):
             if distance <= max_distance and distance > 0:
                 if distance == 1:
                     reason = "1 character difference"
@@ -674,20 +921,23 @@ class ErrorSuggestionEngine:
                     reason = f"{distance} character differences"
                 matches.append((distance, candidate, reason))
         
+        # Lowercase each candidate once for the case-insensitive passes
+        candidate_pairs = [(candidate, candidate.lower()) for candidate in candidates]
+        
         # Prefix matches (for partial typing)
-        for candidate in candidates:
-            if candidate.lower().startswith(target.lower()) and candidate != target:
+        for candidate, candidate_lower in candidate_pairs:
+            if candidate_lower.startswith(target_lower) and candidate != target:
                 matches.append((0.5, candidate, "starts with your input"))
         
         # Substring matches (for partial recall)
-        for candidate in candidates:
-            if target.lower() in candidate.lower() and candidate != target:
+        for candidate, candidate_lower in candidate_pairs:
+            if target_lower in candidate_lower and candidate != target:
                 matches.append((1.5, candidate, "contains your input"))
         
         # Special handling for short names (common abbreviations)
-        if len(target) <= 4:
+        if target_len <= 4:
             for candidate in candidates:
-                if candidate.startswith(target) and len(candidate) <= len(target) + 2:
+                if candidate.startswith(target) and len(candidate) <= target_len + 2:
                     matches.append((0.8, candidate, "short name match"))
         
         # Sort by distance/relevance and return top matches
@@ -708,37 +958,74 @@ class ErrorSuggestionEngine:
         """
         suggestions = []
         
-        # Common typos: missing/extra characters
-        common_typos = {
-            'lenght': 'length',
-            'widht': 'width',
-            'heigth': 'height',
-            'postion': 'position',
-            'positon': 'position',
-            'colum': 'column',
-            'columm': 'column',
-            'indx': 'index',
-            'idx': 'index',
-            'cnt': 'count',
-            'num': 'number',
-            'str': 'string',
-            'val': 'value',
-            'tmp': 'temp',
-            'usr': 'user'
-        }
+        correct_form = ErrorSuggestionEngine.COMMON_TYPOS.get(var_name.lower())
+        if correct_form is not None and correct_form in available_vars:
+            suggestions.append(f"Did you mean '{correct_form}' (common typo)?")
         
-        if var_name.lower() in common_typos:
-            correct_form = common_typos[var_name.lower()]
-            if correct_form in available_vars:
-                suggestions.append(f"Did you mean '{correct_form}' (common typo)?")
-        
-        # Check for transposed characters
-        for var in available_vars:
-            if len(var) == len(var_name) and ErrorSuggestionEngine._is_transposition(var_name, var):
-                suggestions.append(f"Did you mean '{var}' (transposed characters)?")
+        # Check for transposed characters, stopping once the limit is reached
+        for var in ErrorSuggestionEngine._iter_transpositions(var_name, available_vars):
+            if len(suggestions) >= 2:
+                break
+            suggestions.append(f"Did you mean '{var}' (transposed characters)?")
         
         return suggestions[:2]  # Limit to avoid overwhelming
     
+    @staticmethod
+    def _iter_transpositions(target: str, candidates: List[str]) -> Iterator[str]:
+        """
+        Yield the candidates that are one adjacent transposition away from target.
+        
+        With rapidfuzz and numpy, Damerau distances to all same-length
+        candidates come from one cdist call and only the hits are confirmed.
+        For ASCII names without rapidfuzz, each name is packed into one integer
+        and XORed with the target, so all positions are compared at once: a
+        transposition leaves exactly two adjacent nonzero bytes in the result.
+        """
+        target_len = len(target)
+        if RAPIDFUZZ_AVAILABLE:
+            np = _import_numpy()
+            if np is not None:
+                same_length = [candidate for candidate in candidates
+                               if len(candidate) == target_len and candidate != target]
+                if not same_length:
+                    return
+                distances = rapidfuzz_process.cdist(
+                    [target], same_length,
+                    scorer=RapidfuzzDamerauLevenshtein.distance,
+                    score_cutoff=1,
+                    dtype=np.int32
+                )[0]
+                for index in np.flatnonzero(distances == 1).tolist():
+                    candidate = same_length[index]
+                    if RapidfuzzLevenshtein.distance(target, candidate, score_cutoff=2) == 2:
+                        yield candidate
+                return
+        
+        if RAPIDFUZZ_AVAILABLE or not target.isascii():
+            for candidate in candidates:
+                if len(candidate) == target_len and ErrorSuggestionEngine._is_transposition(target, candidate):
+                    yield candidate
+            return
+        
+        target_bytes = target.encode('ascii')
+        target_word = int.from_bytes(target_bytes, 'big')
+        for candidate in candidates:
+            if len(candidate) != target_len or not candidate.isascii():
+                continue
+            candidate_bytes = candidate.encode('ascii')
+            diff = target_word ^ int.from_bytes(candidate_bytes, 'big')
+            if not diff:
+                continue
+            # Byte offsets (from the right) of the lowest and highest differences
+            low = ((diff & -diff).bit_length() - 1) >> 3
+            high = (diff.bit_length() - 1) >> 3
+            if high != low + 1:
+                continue
+            left = target_len - 1 - high
+            if (target_bytes[left] == candidate_bytes[left + 1]
+                    and target_bytes[left + 1] == candidate_bytes[left]):
+                yield candidate
+    
     @staticmethod
     def _is_transposition(str1: str, str2: str) -> bool:
         """
@@ -754,24 +1041,22 @@ class ErrorSuggestionEngine:
         if len(str1) != len(str2) or str1 == str2:
             return False
         
-        differences = []
-        for i, (c1, c2) in enumerate(zip(str1, str2)):
-            if c1 != c2:
-                differences.append(i)
+        if RAPIDFUZZ_AVAILABLE:
+            # For equal lengths, one Damerau edit is either a substitution
+            # (one plain edit) or an adjacent swap (two plain edits)
+            return (RapidfuzzDamerauLevenshtein.distance(str1, str2, score_cutoff=1) == 1
+                    and RapidfuzzLevenshtein.distance(str1, str2, score_cutoff=2) == 2)
         
-        # Check if exactly 2 differences and they are adjacent transpositions
-        if len(differences) == 2:
-            i, j = differences
-            if j == i + 1 and str1[i] == str2[j] and str1[j] == str2[i]:
-                return True
-        
-        return False
+        return core_is_transposition(str1, str2)
     
     @staticmethod
     def _find_close_matches(target: str, candidates: List[str], max_distance: int = 2) -> List[str]:
         """
         Find close matches using simple edit distance (legacy method).
         
+        Results are memoized per (target, candidates, max_distance), since the
+        same name is often looked up against the same scope repeatedly.
+        
         Args:
             target: Target string to match
             candidates: List of candidate strings
@@ -780,46 +1065,137 @@ class ErrorSuggestionEngine:
         Returns:
             List of close matches sorted by distance
         """
+        return list(_cached_close_matches(target, tuple(candidates), max_distance))
+    
+    @staticmethod
+    def _compute_close_matches(target: str, candidates: tuple, max_distance: int) -> tuple:
+        """Uncached body of _find_close_matches."""
+        # A length gap larger than max_distance already exceeds the budget, so
+        # only the length buckets near the target are scanned (merged back into
+        # candidate order, which breaks ties between equal distances)
+        target_len = len(target)
+        buckets = _length_buckets(candidates)
+        indices = sorted(chain.from_iterable(
+            buckets.get(length, ())
+            for length in range(target_len - max_distance, target_len + max_distance + 1)))
+        candidates = [candidates[index] for index in indices]
+        
+        np = _import_numpy() if RAPIDFUZZ_AVAILABLE else None
+        if np is not None and candidates:
+            # Score every candidate in one batched C pass, then pick the three
+            # nearest non-exact matches (stable, so ties keep candidate order)
+            distances = rapidfuzz_process.cdist(
+                [target], candidates,
+                scorer=RapidfuzzLevenshtein.distance,
+                score_cutoff=max_distance,
+                dtype=np.int32
+            )[0]
+            order = np.argsort(distances, kind='stable')
+            ranked = distances[order]
+            nearest = order[(ranked > 0) & (ranked <= max_distance)][:3]
+            return tuple(candidates[index] for index in nearest.tolist())
+        
+        if RAPIDFUZZ_AVAILABLE:
+            # One C call scores, filters and sorts every candidate; exact
+            # matches are dropped first so they cannot take a result slot
+            scored = rapidfuzz_process.extract(
+                target, [candidate for candidate in candidates if candidate != target],
+                scorer=RapidfuzzLevenshtein.distance,
+                score_cutoff=max_distance,
+                limit=3
+            )
+            return tuple(candidate for candidate, _, _ in scored)
+        
         matches = []
         
         for candidate in candidates:
-            distance = ErrorSuggestionEngine._levenshtein_distance(target, candidate)
+            distance = ErrorSuggestionEngine._levenshtein_distance(target, candidate, max_distance)
             if distance <= max_distance and distance > 0:
                 matches.append((distance, candidate))
         
         # Sort by distance and return just the strings
         matches.sort(key=lambda x: x[0])
-        return [match[1] for match in matches[:3]]
+        return tuple(match[1] for match in matches[:3])
+    
+    @staticmethod
+    def _batch_levenshtein(target: str, candidates: List[str], max_distance: int) -> List[int]:
+        """
+        Edit distances from target to each candidate, in candidate order.
+        
+        Distances above max_distance may be reported as any larger value.
+        """
+        if not candidates:
+            return []
+        
+        if RAPIDFUZZ_AVAILABLE:
+            np = _import_numpy()
+            if np is not None:
+                return rapidfuzz_process.cdist(
+                    [target], candidates,
+                    scorer=RapidfuzzLevenshtein.distance,
+                    score_cutoff=max_distance,
+                    dtype=np.int32
+                )[0].tolist()
+            return [RapidfuzzLevenshtein.distance(target, candidate, score_cutoff=max_distance)
+                    for candidate in candidates]
+        
+        return [ErrorSuggestionEngine._levenshtein_distance(target, candidate, max_distance)
+                for candidate in candidates]
     
     @staticmethod
-    def _levenshtein_distance(s1: str, s2: str) -> int:
+    def _levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
         """
         Calculate Levenshtein distance between two strings.
         
         Args:
             s1: First string
             s2: Second string
+            max_distance: Optional bound; if the distance exceeds it,
+                max_distance + 1 is returned as soon as that is certain
             
         Returns:
             Edit distance between the strings
         """
-        if len(s1) < len(s2):
-            return ErrorSuggestionEngine._levenshtein_distance(s2, s1)
-        
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = list(range(len(s2) + 1))
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
+        # The distance is symmetric, so both argument orders share a cache entry
+        if s1 > s2:
+            s1, s2 = s2, s1
+        return _cached_levenshtein(s1, s2, max_distance)
+    
+    @staticmethod
+    def _compute_levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+        """Uncached body of _levenshtein_distance."""
+        if RAPIDFUZZ_AVAILABLE:
+            return RapidfuzzLevenshtein.distance(s1, s2, score_cutoff=max_distance)
+        
+        if ACCEL_AVAILABLE:
+            return accel_levenshtein(s1, s2, -1 if max_distance is None else max_distance)
+        
+        # A mypyc-compiled core is already native, so numba (slow to import
+        # and JIT) is only tried in front of the interpreted one
+        if not CORE_COMPILED:
+            kernel = _get_levenshtein_kernel()
+            if kernel is not None:
+                distance = kernel(s1, s2)
+                if max_distance is not None and distance > max_distance:
+                    return max_distance + 1
+                return distance
+        
+        return core_levenshtein(s1, s2, -1 if max_distance is None else max_distance)
+
+
+# Memoized edit-distance helpers; the same undefined name tends to be checked
+# against the same candidates many times in one run
+_cached_levenshtein = lru_cache(maxsize=8192)(ErrorSuggestionEngine._compute_levenshtein_distance)
+_cached_close_matches = lru_cache(maxsize=256)(ErrorSuggestionEngine._compute_close_matches)
+
+
+@lru_cache(maxsize=64)
+def _length_buckets(candidates: tuple) -> Dict[int, List[int]]:
+    """Index candidate positions by string length."""
+    buckets: Dict[int, List[int]] = {}
+    for index, candidate in enumerate(candidates):
+        buckets.setdefault(len(candidate), []).append(index)
+    return buckets
 
 
 # Convenience functions for creating common error types
@@ -0,0 +1,72 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# engage_errors_accel.pyx
+# Optional compiled edit-distance kernel for the Engage error suggestion engine.
+#
+# Build in place with:  cythonize -i engage_errors_accel.pyx
+# engage_errors picks up the compiled module automatically when it is importable.
+
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+
+
+cpdef int levenshtein(str s1, str s2, int max_distance=-1) except -1:
+    """
+    Levenshtein distance between s1 and s2.
+
+    If max_distance >= 0 and the distance exceeds it, max_distance + 1 is
+    returned as soon as a whole DP row is over budget.
+    """
+    cdef Py_ssize_t len1 = len(s1), len2 = len(s2)
+    cdef Py_ssize_t i, j
+    cdef int cost, substitution, row_min
+    cdef int cap = max_distance + 1
+    cdef bint bounded = max_distance >= 0
+    cdef Py_UCS4 c1
+    cdef int *previous_row
+    cdef int *current_row
+    cdef int *swap
+
+    if len1 < len2:
+        s1, s2 = s2, s1
+        len1, len2 = len2, len1
+
+    if bounded and len1 - len2 > max_distance:
+        return cap
+    if len2 == 0:
+        return cap if bounded and len1 > max_distance else <int>len1
+
+    previous_row = <int *>PyMem_Malloc(2 * (len2 + 1) * sizeof(int))
+    if previous_row == NULL:
+        raise MemoryError()
+    current_row = previous_row + len2 + 1
+
+    try:
+        for j in range(len2 + 1):
+            previous_row[j] = <int>j
+
+        for i in range(len1):
+            c1 = s1[i]
+            current_row[0] = <int>(i + 1)
+            row_min = current_row[0]
+            for j in range(len2):
+                cost = current_row[j] + 1
+                if previous_row[j + 1] + 1 < cost:
+                    cost = previous_row[j + 1] + 1
+                substitution = previous_row[j] + (c1 != s2[j])
+                if substitution < cost:
+                    cost = substitution
+                current_row[j + 1] = cost
+                if cost < row_min:
+                    row_min = cost
+            if bounded and row_min > max_distance:
+                return cap
+            swap = previous_row
+            previous_row = current_row
+            current_row = swap
+
+        cost = previous_row[len2]
+        if bounded and cost > max_distance:
+            return cap
+        return cost
+    finally:
+        # The two rows share one allocation that starts at the lower address
+        PyMem_Free(previous_row if previous_row < current_row else current_row)
@@ -1,17 +1,93 @@
 # engage_game_objects.py
 # Game Object System Foundation for Engage Programming Language
 
-from engage_values import Value, Function, BuiltInFunction, SymbolTable
+from engage_values import Value, Number, String, Vector, Function, BuiltInFunction, SymbolTable
 from engage_errors import EngageRuntimeError
-import uuid
+import itertools
+from collections import deque
+from operator import attrgetter
+from time import perf_counter, sleep
 import math
-from typing import Dict, List, Optional, Callable, Any, Tuple
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Callable, Any, Tuple
+
+# numpy is optional and imported on first use (see GameObjectRegistry)
+_numpy = None
+_numpy_checked = False
+
+def _import_numpy():
+    """Import numpy on first use; returns None when it is not installed."""
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+# Optional JIT kernel for the registry's broad phase; numba is slow to import,
+# so it is only loaded the first time the kernel is needed
+_jit_find_overlaps = None
+_numba_checked = False
+
+def _get_overlap_kernel():
+    """Return the numba-compiled AABB pair finder, or None if numba is unavailable."""
+    global _jit_find_overlaps, _numba_checked
+    if _numba_checked:
+        return _jit_find_overlaps
+    _numba_checked = True
+    
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True, fastmath=True)
+    def find_overlaps_kernel(order, lefts, rights, tops, bottoms, out_a, out_b):
+        """Sweep AABB pairs (order sorts lefts) into out_a/out_b; -1 if the buffers are too small."""
+        count = 0
+        capacity = out_a.shape[0]
+        n = order.shape[0]
+        for k in range(n):
+            i = order[k]
+            right_i = rights[i]
+            for m in range(k + 1, n):
+                j = order[m]
+                # Boxes are sorted by left edge, so no later box can reach back
+                if lefts[j] >= right_i:
+                    break
+                if lefts[i] < rights[j] and tops[i] < bottoms[j] and tops[j] < bottoms[i]:
+                    if count == capacity:
+                        return -1
+                    out_a[count] = i
+                    out_b[count] = j
+                    count += 1
+        return count
+    
+    def find_overlaps(order, lefts, rights, tops, bottoms):
+        # Preallocated int32 pair buffers, doubled and retried on overflow
+        capacity = max(64, 4 * lefts.shape[0])
+        while True:
+            out_a = np.empty(capacity, dtype=np.int32)
+            out_b = np.empty(capacity, dtype=np.int32)
+            count = find_overlaps_kernel(order, lefts, rights, tops, bottoms, out_a, out_b)
+            if count >= 0:
+                return out_a[:count], out_b[:count]
+            capacity *= 2
+    
+    _jit_find_overlaps = find_overlaps
+    return _jit_find_overlaps
 
 # --- Game Event System ---
 
 class GameEvent:
     """Represents a game event that can be triggered on game objects."""
     
+    __slots__ = ('event_type', 'source_object', 'data', 'timestamp', 'handled')
+    
     def __init__(self, event_type: str, source_object=None, data=None):
         self.event_type = event_type  # 'collision', 'update', 'render', 'destroy', etc.
         self.source_object = source_object
@@ -31,30 +107,96 @@ class GameEvent:
 class Transform:
     """Represents position, rotation, and scale of a game object."""
     
+    __slots__ = ('_x', '_y', '_rotation', '_rot_rad', '_scale_x', '_scale_y',
+                 '_world_matrix', '_matrix_array', '_trig_dirty', '_cos_r', '_sin_r', '_owner')
+    
     def __init__(self, x: float = 0.0, y: float = 0.0, rotation: float = 0.0, scale_x: float = 1.0, scale_y: float = 1.0):
-        self.x = x
-        self.y = y
-        self.rotation = rotation  # In degrees
-        self.scale_x = scale_x
-        self.scale_y = scale_y
-        
-        # Cached values for performance
-        self._dirty = True
+        # Position, rotation and scale are properties (see below) so direct
+        # writes reach the cached trig values, the owner's caches and its
+        # registry columns
+        self._x = x
+        self._y = y
+        # The angle in degrees and in radians; set_rotation is the only writer
+        # of either, so the two cannot drift apart
+        self._rotation = 0.0
+        self._rot_rad = 0.0
+        self._scale_x = scale_x
+        self._scale_y = scale_y
+        
+        # Cached values for performance; the matrix is only built when asked for
         self._world_matrix = None
+        self._matrix_array = None
+        self._trig_dirty = True
+        self._cos_r = 1.0
+        self._sin_r = 0.0
+        
+        # Game object notified when the transform changes
+        self._owner = None
+        
+        if rotation:
+            self.set_rotation(rotation)
+    
+    @property
+    def x(self) -> float:
+        """Horizontal position."""
+        return self._x
+    
+    @x.setter
+    def x(self, x: float):
+        self.set_position(x, self._y)
+    
+    @property
+    def y(self) -> float:
+        """Vertical position."""
+        return self._y
+    
+    @y.setter
+    def y(self, y: float):
+        self.set_position(self._x, y)
+    
+    @property
+    def rotation(self) -> float:
+        """Rotation in degrees."""
+        return self._rotation
+    
+    @rotation.setter
+    def rotation(self, rotation: float):
+        self.set_rotation(rotation)
+    
+    @property
+    def scale_x(self) -> float:
+        """Horizontal scale factor."""
+        return self._scale_x
+    
+    @scale_x.setter
+    def scale_x(self, scale_x: float):
+        self.set_scale(scale_x, self._scale_y)
+    
+    @property
+    def scale_y(self) -> float:
+        """Vertical scale factor."""
+        return self._scale_y
+    
+    @scale_y.setter
+    def scale_y(self, scale_y: float):
+        self.set_scale(self._scale_x, scale_y)
     
     def set_position(self, x: float, y: float):
         """Set the position of the transform."""
-        if self.x != x or self.y != y:
-            self.x = x
-            self.y = y
+        if self._x != x or self._y != y:
+            self._x = x
+            self._y = y
             self._mark_dirty()
     
     def set_rotation(self, rotation: float):
         """Set the rotation in degrees."""
-        # Normalize rotation to 0-360 range
-        rotation = rotation % 360
-        if self.rotation != rotation:
-            self.rotation = rotation
+        # Normalize rotation to 0-360 range (values already in range skip the modulo)
+        if not 0.0 <= rotation < 360.0:
+            rotation = rotation % 360
+        if self._rotation != rotation:
+            self._rotation = rotation
+            self._rot_rad = math.radians(rotation)
+            self._trig_dirty = True
             self._mark_dirty()
     
     def set_scale(self, scale_x: float, scale_y: float = None):
@@ -62,34 +204,43 @@ class Transform:
         if scale_y is None:
             scale_y = scale_x
         
-        if self.scale_x != scale_x or self.scale_y != scale_y:
-            self.scale_x = scale_x
-            self.scale_y = scale_y
+        if self._scale_x != scale_x or self._scale_y != scale_y:
+            self._scale_x = scale_x
+            self._scale_y = scale_y
+            if self._owner is not None:
+                self._owner._update_collision_extents()
             self._mark_dirty()
     
+    def get_rotation_radians(self) -> float:
+        """Get the rotation in radians."""
+        return self._rot_rad
+    
     def translate(self, dx: float, dy: float):
         """Move the transform by the given offset."""
-        self.set_position(self.x + dx, self.y + dy)
+        self.set_position(self._x + dx, self._y + dy)
     
     def rotate(self, degrees: float):
         """Rotate the transform by the given degrees."""
-        self.set_rotation(self.rotation + degrees)
+        self.set_rotation(self._rotation + degrees)
     
     def scale(self, factor_x: float, factor_y: float = None):
         """Scale the transform by the given factors."""
         if factor_y is None:
             factor_y = factor_x
-        self.set_scale(self.scale_x * factor_x, self.scale_y * factor_y)
+        self.set_scale(self._scale_x * factor_x, self._scale_y * factor_y)
     
     def get_forward_vector(self) -> Tuple[float, float]:
         """Get the forward direction vector based on rotation."""
-        rad = math.radians(self.rotation)
-        return (math.cos(rad), math.sin(rad))
+        if self._trig_dirty:
+            self._ensure_trig()
+        return (self._cos_r, self._sin_r)
     
     def get_right_vector(self) -> Tuple[float, float]:
         """Get the right direction vector based on rotation."""
-        rad = math.radians(self.rotation + 90)
-        return (math.cos(rad), math.sin(rad))
+        # Forward vector rotated by 90 degrees: (cos(r + 90), sin(r + 90))
+        if self._trig_dirty:
+            self._ensure_trig()
+        return (-self._sin_r, self._cos_r)
     
     def distance_to(self, other: 'Transform') -> float:
         """Calculate distance to another transform."""
@@ -97,6 +248,12 @@ class Transform:
         dy = self.y - other.y
         return math.sqrt(dx * dx + dy * dy)
     
+    def distance_to_squared(self, other: 'Transform') -> float:
+        """Calculate squared distance to another transform (no sqrt; for comparisons)."""
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+    
     def angle_to(self, other: 'Transform') -> float:
         """Calculate angle to another transform in degrees."""
         dx = other.x - self.x
@@ -104,26 +261,57 @@ class Transform:
         return math.degrees(math.atan2(dy, dx))
     
     def _mark_dirty(self):
-        """Mark the transform as dirty for matrix recalculation."""
-        self._dirty = True
-    
-    def get_world_matrix(self):
-        """Get the world transformation matrix (for advanced rendering)."""
-        if self._dirty or self._world_matrix is None:
+        """Drop the cached matrix so the next request rebuilds it."""
+        self._world_matrix = None
+        self._matrix_array = None
+        if self._owner is not None:
+            self._owner._on_transform_changed()
+    
+    def _ensure_trig(self):
+        """Recompute the cached cosine and sine of the rotation."""
+        rad = self._rot_rad
+        self._cos_r = math.cos(rad)
+        self._sin_r = math.sin(rad)
+        self._trig_dirty = False
+    
+    def get_world_matrix(self) -> Tuple[float, float, float, float, float, float]:
+        """
+        Get the world transformation matrix (for advanced rendering).
+        
+        The 2D affine matrix [[a, b, tx], [c, d, ty], [0, 0, 1]] is returned
+        as its six free entries (a, b, c, d, tx, ty).
+        """
+        if self._world_matrix is None:
             # Simple 2D transformation matrix calculation
-            cos_r = math.cos(math.radians(self.rotation))
-            sin_r = math.sin(math.radians(self.rotation))
+            if self._trig_dirty:
+                self._ensure_trig()
+            cos_r = self._cos_r
+            sin_r = self._sin_r
             
-            # 3x3 transformation matrix for 2D
-            self._world_matrix = [
-                [self.scale_x * cos_r, -self.scale_x * sin_r, self.x],
-                [self.scale_y * sin_r,  self.scale_y * cos_r, self.y],
-                [0, 0, 1]
-            ]
-            self._dirty = False
+            self._world_matrix = (
+                self._scale_x * cos_r, -self._scale_x * sin_r,
+                self._scale_y * sin_r, self._scale_y * cos_r,
+                self._x, self._y
+            )
         
         return self._world_matrix
     
+    def matrix_array(self):
+        """
+        Get the world matrix as a contiguous float32 array for renderers.
+        
+        Returns:
+            numpy float32 array of shape (6,), or array('f') without numpy
+        """
+        matrix = self.get_world_matrix()
+        if self._matrix_array is None:
+            np = _import_numpy()
+            if np is not None:
+                self._matrix_array = np.asarray(matrix, dtype=np.float32)
+            else:
+                self._matrix_array = array('f', matrix)
+        return self._matrix_array
+    
     def copy(self) -> 'Transform':
         """Create a copy of this transform."""
         return Transform(self.x, self.y, self.rotation, self.scale_x, self.scale_y)
@@ -134,66 +322,69 @@ class Transform:
 # --- Collision System ---
 
 class BoundingBox:
-    """Represents an axis-aligned bounding box for collision detection."""
+    """
+    Represents an axis-aligned bounding box for collision detection.
+    
+    Boxes are immutable: the edges and center are computed once in __init__
+    and stored as plain attributes, so writing x, y, width or height would
+    leave them stale. Build a new box (or call expand) instead. The compiled
+    class in engage_game_objects_accel enforces this with read-only fields.
+    """
+    
+    __slots__ = ('x', 'y', 'width', 'height', 'left', 'top', 'right', 'bottom', 'center_x', 'center_y')
     
     def __init__(self, x: float, y: float, width: float, height: float):
-        self.x = x
-        self.y = y
+        self.x = self.left = x
+        self.y = self.top = y
         self.width = width
         self.height = height
-    
-    @property
-    def left(self) -> float:
-        return self.x
-    
-    @property
-    def right(self) -> float:
-        return self.x + self.width
-    
-    @property
-    def top(self) -> float:
-        return self.y
-    
-    @property
-    def bottom(self) -> float:
-        return self.y + self.height
-    
-    @property
-    def center_x(self) -> float:
-        return self.x + self.width / 2
-    
-    @property
-    def center_y(self) -> float:
-        return self.y + self.height / 2
+        self.right = x + width
+        self.bottom = y + height
+        self.center_x = x + width / 2
+        self.center_y = y + height / 2
     
     def contains_point(self, x: float, y: float) -> bool:
         """Check if a point is inside this bounding box."""
-        return (self.left <= x <= self.right and 
-                self.top <= y <= self.bottom)
+        return (self.x <= x <= self.right and 
+                self.y <= y <= self.bottom)
     
     def intersects(self, other: 'BoundingBox') -> bool:
-        """Check if this bounding box intersects with another."""
-        return not (self.right < other.left or 
-                   self.left > other.right or 
-                   self.bottom < other.top or 
-                   self.top > other.bottom)
-    
-    def get_intersection(self, other: 'BoundingBox') -> Optional['BoundingBox']:
-        """Get the intersection rectangle with another bounding box."""
-        if not self.intersects(other):
+        """Check if this bounding box intersects with another (touching edges do not count)."""
+        return (self.x < other.right and other.x < self.right and
+                self.y < other.bottom and other.y < self.bottom)
+    
+    def get_intersection_rect(self, other: 'BoundingBox') -> Optional[Tuple[float, float, float, float]]:
+        """Get the intersection with another bounding box as (x, y, width, height), without allocating a box."""
+        left = self.x if self.x > other.x else other.x
+        right = self.right if self.right < other.right else other.right
+        width = right - left
+        if width <= 0:
             return None
         
-        left = max(self.left, other.left)
-        top = max(self.top, other.top)
-        right = min(self.right, other.right)
-        bottom = min(self.bottom, other.bottom)
+        top = self.y if self.y > other.y else other.y
+        bottom = self.bottom if self.bottom < other.bottom else other.bottom
+        height = bottom - top
+        if height <= 0:
+            return None
         
-        return BoundingBox(left, top, right - left, bottom - top)
+        return (left, top, width, height)
+    
+    def get_intersection(self, other: 'BoundingBox') -> Optional['BoundingBox']:
+        """Get the intersection rectangle with another bounding box."""
+        rect = self.get_intersection_rect(other)
+        return BoundingBox(*rect) if rect is not None else None
+    
+    def overlap_area(self, other: 'BoundingBox') -> float:
+        """Get the area of overlap with another bounding box (0.0 if they do not overlap)."""
+        width = ((self.right if self.right < other.right else other.right) -
+                 (self.x if self.x > other.x else other.x))
+        height = ((self.bottom if self.bottom < other.bottom else other.bottom) -
+                  (self.y if self.y > other.y else other.y))
+        return width * height if width > 0 and height > 0 else 0.0
     
     def get_overlap_area(self, other: 'BoundingBox') -> float:
         """Get the area of overlap with another bounding box."""
-        intersection = self.get_intersection(other)
-        return intersection.width * intersection.height if intersection else 0.0
+        return self.overlap_area(other)
     
     def expand(self, amount: float) -> 'BoundingBox':
         """Create a new bounding box expanded by the given amount."""
@@ -207,9 +398,18 @@ class BoundingBox:
     def __repr__(self):
         return f"BoundingBox(x={self.x:.2f}, y={self.y:.2f}, w={self.width:.2f}, h={self.height:.2f})"
 
+# Optional compiled BoundingBox built from engage_game_objects_accel.pyx
+try:
+    from engage_game_objects_accel import BoundingBox
+    ACCEL_AVAILABLE = True
+except ImportError:
+    ACCEL_AVAILABLE = False
+
 class CollisionInfo:
     """Contains information about a collision between two game objects."""
     
+    __slots__ = ('object_a', 'object_b', 'overlap_area', 'collision_point', 'collision_normal', 'penetration_depth')
+    
     def __init__(self, object_a, object_b, overlap_area: float = 0.0, collision_point: Tuple[float, float] = None):
         self.object_a = object_a
         self.object_b = object_b
@@ -224,10 +424,11 @@ class CollisionInfo:
         bbox_b = self.object_b.get_bounding_box()
         
         if bbox_a and bbox_b:
-            intersection = bbox_a.get_intersection(bbox_b)
-            if intersection:
-                self.overlap_area = intersection.width * intersection.height
-                self.collision_point = (intersection.center_x, intersection.center_y)
+            rect = bbox_a.get_intersection_rect(bbox_b)
+            if rect is not None:
+                left, top, width, height = rect
+                self.overlap_area = width * height
+                self.collision_point = (left + width / 2, top + height / 2)
                 
                 # Calculate collision normal (direction from A to B)
                 dx = bbox_b.center_x - bbox_a.center_x
@@ -236,7 +437,7 @@ class CollisionInfo:
                 
                 if length > 0:
                     self.collision_normal = (dx / length, dy / length)
-                    self.penetration_depth = min(intersection.width, intersection.height)
+                    self.penetration_depth = width if width < height else height
     
     def __repr__(self):
         return f"CollisionInfo({self.object_a} <-> {self.object_b}, area={self.overlap_area:.2f})"
@@ -246,6 +447,10 @@ class CollisionInfo:
 class Sprite:
     """Represents a sprite for rendering game objects."""
     
+    __slots__ = ('sprite_path', 'width', 'height', 'offset_x', 'offset_y', 'tint_color',
+                 'flip_horizontal', 'flip_vertical', 'visible',
+                 'frame_count', 'current_frame', 'animation_speed', 'animation_time', 'loop_animation')
+    
     def __init__(self, sprite_path: str = "", width: float = 32.0, height: float = 32.0):
         self.sprite_path = sprite_path
         self.width = width
@@ -346,46 +551,161 @@ class Sprite:
     def __repr__(self):
         return f"Sprite(path='{self.sprite_path}', size=({self.width:.1f}x{self.height:.1f}), frame={self.current_frame}/{self.frame_count})"
 
+class RenderRecord(NamedTuple):
+    """
+    Flat snapshot of everything a renderer needs for one game object.
+    
+    Carries the same values as GameObject.prepare_render_data in a single
+    tuple instead of a dict with nested transform/sprite/collision dicts.
+    """
+    object_type: str
+    object_id: str
+    x: float
+    y: float
+    rotation: float
+    scale_x: float
+    scale_y: float
+    sprite_path: str
+    sprite_width: float
+    sprite_height: float
+    offset_x: float
+    offset_y: float
+    tint_color: Tuple[int, int, int, int]
+    flip_horizontal: bool
+    flip_vertical: bool
+    current_frame: int
+    frame_count: int
+    collision_enabled: bool
+    collision_width: float
+    collision_height: float
+    collision_offset_x: float
+    collision_offset_y: float
+    is_trigger: bool
+    visible: bool
+    active: bool
+    tags: Tuple[str, ...]
+
 # --- Base Game Object ---
 
+# Source of GameObject._int_id values (and default object ids)
+_id_counter = itertools.count()
+
+def _settle_id_clash(table: Dict[str, 'GameObject'], game_object: 'GameObject'):
+    """
+    Make room for game_object in an object_id -> game_object table.
+    
+    Generated ids ("GameObject_3") can equal an id a caller chose. When
+    another object already holds the id, whichever of the two has a
+    generated id is given a new one, so neither silently replaces the
+    other. Two caller-supplied ids still overwrite, as before.
+    """
+    holder = table.get(game_object.object_id)
+    if holder is None or holder is game_object:
+        return
+    if game_object._id_generated:
+        game_object._renew_generated_id(table)
+    elif holder._id_generated:
+        holder._renew_generated_id(table)
+
 class GameObject(Value):
     """Base class for all game objects in Engage."""
     
+    # No per-instance __dict__ (subclasses get one unless they declare slots);
+    # transform and sprite stay unset until first use, see __getattr__
+    __slots__ = ('object_type', '_int_id', 'object_id', '_id_generated', '_transform', 'sprite',
+                 '_registry', '_registry_index', '_manager',
+                 '_collision_enabled', '_collision_width', '_collision_height',
+                 '_collision_offset_x', '_collision_offset_y', 'is_trigger', '_col_hw', '_col_hh', '_bbox_cache',
+                 'motion_type', '_grid_cells', '_grid_range', '_grid_dirty', '_pair_pass', '_pair_partners',
+                 'parent', 'children', '_parent_index',
+                 '_active', 'visible', 'destroy_on_next_frame', 'event_handlers',
+                 'update_enabled', 'render_enabled', '_render_order', 'tags', '_by_id', '_by_tag',
+                 '__weakref__')
+    
     def __init__(self, object_type: str = "GameObject", object_id: str = None):
         super().__init__()
         self.object_type = object_type
-        self.object_id = object_id or str(uuid.uuid4())
-        
-        # Core components
-        self.transform = Transform()
-        self.sprite = Sprite()
-        
-        # Collision properties
-        self.collision_enabled = True
-        self.collision_width = 32.0
-        self.collision_height = 32.0
-        self.collision_offset_x = 0.0
-        self.collision_offset_y = 0.0
+        # Dense integer id for internal lookups; the string id defaults to it
+        self._int_id = next(_id_counter)
+        self.object_id = object_id or f"{object_type}_{self._int_id}"
+        self._id_generated = not object_id  # See _settle_id_clash
+        
+        # Core components (transform and sprite) are created on first access;
+        # see __getattr__
+        
+        # Registry mirroring this object's collision fields (see GameObjectRegistry)
+        self._registry = None
+        self._registry_index = -1
+        # Manager this object is registered with, whose tag index follows add_tag/remove_tag
+        self._manager = None
+        
+        # Collision properties (the box fields are properties, see Collision System)
+        self._collision_enabled = True  # See the collision_enabled property
+        self._collision_width = 32.0
+        self._collision_height = 32.0
+        self._collision_offset_x = 0.0
+        self._collision_offset_y = 0.0
         self.is_trigger = False  # If true, collision events fire but no physics response
         
+        # Scaled collision half-extents, refreshed when the box or scale changes
+        self._col_hw = 16.0
+        self._col_hh = 16.0
+        # Last BoundingBox from get_bounding_box, dropped when the transform or box changes
+        self._bbox_cache = None
+        
+        # "dynamic" objects are re-gridded every frame by GameObjectManager.update_all;
+        # "static" ones only when they are registered
+        self.motion_type = "dynamic"
+        # Spatial grid cells this object occupies in its manager, and their index range
+        self._grid_cells = ()
+        self._grid_range = None
+        self._grid_dirty = True  # Moved, resized or toggled since it was last gridded
+        # Broad-phase pass that _pair_partners belongs to, and the _int_ids already paired in it
+        self._pair_pass = -1
+        self._pair_partners = None
+        
         # Hierarchy management
         self.parent = None
         self.children = []
+        self._parent_index = -1  # Position in parent.children
         
         # Game state
-        self.active = True
+        self._active = True  # See the active property
         self.visible = True
         self.destroy_on_next_frame = False
         
         # Event handling
-        self.event_handlers = {}  # event_type -> list of callback functions
+        self.event_handlers = None  # event_type -> list of callback functions, created on first add
         
         # Game loop hooks
         self.update_enabled = True
         self.render_enabled = True
+        self._render_order = 0  # Sort key for GameObjectManager.render_all (see render_order)
         
         # Tags for categorization and searching
         self.tags = set()
+        
+        # Lookup tables over all descendants, kept only on hierarchy roots
+        # (None until the first child is added)
+        self._by_id = None  # object_id -> game_object
+        self._by_tag = None  # tag -> {game_object: None}, in insertion order
+    
+    def __getattr__(self, name):
+        """Create the transform or sprite the first time it is used."""
+        # Only reached when normal lookup fails, so materialized components
+        # are plain instance attributes with no per-access cost
+        if name == 'transform':
+            # Reached through the transform property while _transform is unset;
+            # a default transform matches the cached extents, so no sync is needed
+            transform = Transform()
+            transform._owner = self
+            self._transform = transform
+            return transform
+        if name == 'sprite':
+            sprite = Sprite()
+            self.sprite = sprite
+            return sprite
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
     
     def __repr__(self):
         return f"<{self.object_type} id='{self.object_id}' at ({self.transform.x:.1f}, {self.transform.y:.1f})>"
@@ -399,8 +719,56 @@ class GameObject(Value):
         """Game objects are considered 'true' if they are active."""
         return self.active
     
+    # --- State Flags ---
+    # active and collision_enabled are written through to the registry, whose
+    # array queries filter on them without touching each object
+    
+    @property
+    def active(self) -> bool:
+        """Whether this object updates, renders, collides and handles events."""
+        return self._active
+    
+    @active.setter
+    def active(self, active: bool):
+        self._active = active
+        if self._registry is not None:
+            self._registry.sync(self)
+    
+    def set_active(self, active: bool):
+        """Activate or deactivate this game object."""
+        self.active = active
+    
+    @property
+    def collision_enabled(self) -> bool:
+        """Whether this object takes part in collision detection."""
+        return self._collision_enabled
+    
+    @collision_enabled.setter
+    def collision_enabled(self, enabled: bool):
+        self._collision_enabled = enabled
+        self._grid_dirty = True
+        if self._registry is not None:
+            self._registry.sync(self)
+    
+    def set_collision_enabled(self, enabled: bool):
+        """Enable or disable collision detection for this game object."""
+        self.collision_enabled = enabled
+    
     # --- Transform Properties ---
     
+    @property
+    def transform(self) -> Transform:
+        """Position, rotation and scale of this object, created on first use."""
+        return self._transform
+    
+    @transform.setter
+    def transform(self, transform: Transform):
+        transform._owner = self
+        self._transform = transform
+        self._update_collision_extents()
+        if self._registry is not None:
+            self._registry.sync(self)
+    
     def set_position(self, x: float, y: float):
         """Set the position of the game object."""
         self.transform.set_position(x, y)
@@ -472,41 +840,123 @@ class GameObject(Value):
         self.sprite.set_animation(frame_count, animation_speed, loop)
     
     # --- Collision System ---
+    # The collision box fields are written through to the cached extents and
+    # bounding box and to the registry, like active and collision_enabled
+    
+    @property
+    def collision_width(self) -> float:
+        """Width of the collision box before scaling."""
+        return self._collision_width
+    
+    @collision_width.setter
+    def collision_width(self, width: float):
+        self._collision_width = width
+        self._update_collision_extents()
+        if self._registry is not None:
+            self._registry.sync(self)
+    
+    @property
+    def collision_height(self) -> float:
+        """Height of the collision box before scaling."""
+        return self._collision_height
+    
+    @collision_height.setter
+    def collision_height(self, height: float):
+        self._collision_height = height
+        self._update_collision_extents()
+        if self._registry is not None:
+            self._registry.sync(self)
+    
+    @property
+    def collision_offset_x(self) -> float:
+        """Horizontal offset of the collision box from the transform position."""
+        return self._collision_offset_x
+    
+    @collision_offset_x.setter
+    def collision_offset_x(self, offset_x: float):
+        self._collision_offset_x = offset_x
+        self._on_transform_changed()
+    
+    @property
+    def collision_offset_y(self) -> float:
+        """Vertical offset of the collision box from the transform position."""
+        return self._collision_offset_y
+    
+    @collision_offset_y.setter
+    def collision_offset_y(self, offset_y: float):
+        self._collision_offset_y = offset_y
+        self._on_transform_changed()
     
     def set_collision_box(self, width: float, height: float, offset_x: float = 0.0, offset_y: float = 0.0):
         """Set the collision box dimensions and offset."""
-        self.collision_width = width
-        self.collision_height = height
-        self.collision_offset_x = offset_x
-        self.collision_offset_y = offset_y
+        self._collision_width = width
+        self._collision_height = height
+        self._collision_offset_x = offset_x
+        self._collision_offset_y = offset_y
+        self._update_collision_extents()
+        if self._registry is not None:
+            self._registry.sync(self)
+    
+    def _update_collision_extents(self):
+        """Recompute the cached half-extents of the scaled collision box."""
+        transform = self.transform
+        self._col_hw = self._collision_width * transform._scale_x * 0.5
+        self._col_hh = self._collision_height * transform._scale_y * 0.5
+        self._bbox_cache = None
+        self._grid_dirty = True
+    
+    def _on_transform_changed(self):
+        """Write transform (or collision offset) changes through to the registry, if any."""
+        self._bbox_cache = None
+        self._grid_dirty = True
+        if self._registry is not None:
+            self._registry.sync(self)
     
     def get_bounding_box(self) -> BoundingBox:
-        """Get the current bounding box for collision detection."""
-        if not self.collision_enabled:
-            return None
+        """
+        Get the current bounding box for collision detection.
         
-        x = self.transform.x + self.collision_offset_x - (self.collision_width * self.transform.scale_x) / 2
-        y = self.transform.y + self.collision_offset_y - (self.collision_height * self.transform.scale_y) / 2
-        width = self.collision_width * self.transform.scale_x
-        height = self.collision_height * self.transform.scale_y
+        Boxes are immutable, so the same box is returned until the transform
+        setters or set_collision_box change it.
+        """
+        if not self._collision_enabled:
+            return None
         
-        return BoundingBox(x, y, width, height)
+        bbox = self._bbox_cache
+        if bbox is None:
+            half_width = self._col_hw
+            half_height = self._col_hh
+            transform = self.transform
+            bbox = self._bbox_cache = BoundingBox(transform._x + self._collision_offset_x - half_width,
+                                                  transform._y + self._collision_offset_y - half_height,
+                                                  half_width * 2, half_height * 2)
+        return bbox
+    
+    def get_bbox_tuple(self) -> Tuple[float, float, float, float]:
+        """
+        Get the collision box edges without allocating a BoundingBox.
+        
+        Returns:
+            (left, top, right, bottom), equal to the matching BoundingBox fields
+        """
+        half_width = self._col_hw
+        half_height = self._col_hh
+        transform = self.transform
+        left = transform._x + self._collision_offset_x - half_width
+        top = transform._y + self._collision_offset_y - half_height
+        return (left, top, left + half_width * 2, top + half_height * 2)
     
     def collides_with(self, other: 'GameObject') -> bool:
         """Check if this game object collides with another."""
-        if not self.collision_enabled or not other.collision_enabled:
+        if not self._collision_enabled or not other._collision_enabled:
             return False
         
-        if not self.active or not other.active:
+        if not self._active or not other._active:
             return False
         
-        bbox_self = self.get_bounding_box()
-        bbox_other = other.get_bounding_box()
-        
-        if not bbox_self or not bbox_other:
-            return False
-        
-        return bbox_self.intersects(bbox_other)
+        a_left, a_top, a_right, a_bottom = self.get_bbox_tuple()
+        b_left, b_top, b_right, b_bottom = other.get_bbox_tuple()
+        return a_left < b_right and b_left < a_right and a_top < b_bottom and b_top < a_bottom
     
     def get_collision_info(self, other: 'GameObject') -> Optional[CollisionInfo]:
         """Get detailed collision information with another game object."""
@@ -521,6 +971,10 @@ class GameObject(Value):
         """Calculate distance to another game object."""
         return self.transform.distance_to(other.transform)
     
+    def distance_squared_to(self, other: 'GameObject') -> float:
+        """Calculate squared distance to another game object (no sqrt; for comparisons)."""
+        return self.transform.distance_to_squared(other.transform)
+    
     def angle_to(self, other: 'GameObject') -> float:
         """Calculate angle to another game object in degrees."""
         return self.transform.angle_to(other.transform)
@@ -535,14 +989,123 @@ class GameObject(Value):
         if child_object.parent:
             child_object.parent.remove_child(child_object)
         
+        # The child's subtree moves from its own tables into this tree's root
+        subtree = [child_object]
+        if child_object._by_id is not None:
+            subtree.extend(child_object._by_id.values())
+        child_object._by_id = None
+        child_object._by_tag = None
+        
         child_object.parent = self
+        child_object._parent_index = len(self.children)
         self.children.append(child_object)
+        self.get_root()._index_objects(subtree)
+        self._mark_hierarchy_dirty(child_object)
     
     def remove_child(self, child_object: 'GameObject'):
-        """Remove a child game object."""
-        if child_object in self.children:
+        """
+        Remove a child game object.
+        
+        The last child is moved into the freed slot, so this is O(1) but does
+        not preserve the order of the remaining children.
+        """
+        if child_object.parent is self:
+            root = self.get_root()
             child_object.parent = None
-            self.children.remove(child_object)
+            index = child_object._parent_index
+            last = self.children.pop()
+            if last is not child_object:
+                self.children[index] = last
+                last._parent_index = index
+            child_object._parent_index = -1
+            
+            # The detached child becomes a root and takes its subtree's entries along
+            descendants = list(child_object._iter_descendants())
+            root._unindex_objects([child_object] + descendants)
+            child_object._index_objects(descendants)
+            self._mark_hierarchy_dirty(child_object)
+    
+    def _iter_descendants(self):
+        """Yield every descendant of this object, pre-order."""
+        stack = list(reversed(self.children))
+        while stack:
+            game_object = stack.pop()
+            yield game_object
+            stack.extend(reversed(game_object.children))
+    
+    def _index_objects(self, game_objects: List['GameObject']):
+        """Add descendants to this root's id and tag tables."""
+        if not game_objects:
+            return
+        if self._by_id is None:
+            self._by_id = {}
+            self._by_tag = {}
+        by_id = self._by_id
+        by_tag = self._by_tag
+        for game_object in game_objects:
+            _settle_id_clash(by_id, game_object)
+            by_id[game_object.object_id] = game_object
+            for tag in game_object.tags:
+                members = by_tag.get(tag)
+                if members is None:
+                    members = by_tag[tag] = {}
+                members[game_object] = None
+    
+    def _unindex_objects(self, game_objects: List['GameObject']):
+        """Remove descendants from this root's id and tag tables."""
+        if self._by_id is None:
+            return
+        by_id = self._by_id
+        by_tag = self._by_tag
+        for game_object in game_objects:
+            if by_id.get(game_object.object_id) is game_object:
+                del by_id[game_object.object_id]
+            for tag in game_object.tags:
+                members = by_tag.get(tag)
+                if members is not None:
+                    members.pop(game_object, None)
+                    if not members:
+                        del by_tag[tag]
+    
+    def _renew_generated_id(self, table: Dict[str, 'GameObject']):
+        """
+        Give this object a new generated object_id that is free in table.
+        
+        The manager's and root's id tables holding the old id are re-keyed.
+        """
+        old_id = self.object_id
+        tables = [table]
+        if self._manager is not None:
+            tables.append(self._manager.objects)
+        root_by_id = self.get_root()._by_id
+        if root_by_id is not None:
+            tables.append(root_by_id)
+        
+        new_id = f"{self.object_type}_{next(_id_counter)}"
+        while any(new_id in id_table for id_table in tables):
+            new_id = f"{self.object_type}_{next(_id_counter)}"
+        self.object_id = new_id
+        for id_table in tables:
+            if id_table.get(old_id) is self:
+                del id_table[old_id]
+                id_table[new_id] = self
+    
+    def _is_descendant_of(self, ancestor: 'GameObject') -> bool:
+        """Check whether ancestor is above this object in the hierarchy."""
+        current = self.parent
+        while current is not None:
+            if current is ancestor:
+                return True
+            current = current.parent
+        return False
+    
+    def _mark_hierarchy_dirty(self, child_object: 'GameObject'):
+        """Tell the registries holding this tree or the child that their traversal order is stale."""
+        root = self.get_root()
+        if root._registry is not None:
+            root._registry._flat_dirty = True
+        if child_object._registry is not None:
+            child_object._registry._flat_dirty = True
     
     def get_children(self) -> List['GameObject']:
         """Get all child game objects."""
@@ -560,33 +1123,55 @@ class GameObject(Value):
         return current
     
     def find_child_by_id(self, object_id: str) -> Optional['GameObject']:
-        """Find a child game object by its ID (recursive search)."""
-        for child in self.children:
-            if child.object_id == object_id:
-                return child
-            found = child.find_child_by_id(object_id)
-            if found:
-                return found
-        return None
+        """Find a descendant game object by its ID (via the root's id table)."""
+        root = self.get_root()
+        if root._by_id is None:
+            return None
+        found = root._by_id.get(object_id)
+        if found is None or (root is not self and not found._is_descendant_of(self)):
+            return None
+        return found
     
     def find_children_by_tag(self, tag: str) -> List['GameObject']:
-        """Find all child game objects with a specific tag (recursive search)."""
-        results = []
-        for child in self.children:
-            if tag in child.tags:
-                results.append(child)
-            results.extend(child.find_children_by_tag(tag))
-        return results
+        """Find all descendant game objects with a specific tag (via the root's tag table)."""
+        root = self.get_root()
+        if root._by_tag is None:
+            return []
+        members = root._by_tag.get(tag, ())
+        if root is self:
+            return list(members)
+        return [game_object for game_object in members if game_object._is_descendant_of(self)]
     
     # --- Tag System ---
     
     def add_tag(self, tag: str):
         """Add a tag to this game object."""
+        if tag in self.tags:
+            return
         self.tags.add(tag)
+        if self.parent is not None:
+            by_tag = self.get_root()._by_tag
+            members = by_tag.get(tag)
+            if members is None:
+                members = by_tag[tag] = {}
+            members[self] = None
+        if self._manager is not None:
+            self._manager._index_tag(self, tag)
     
     def remove_tag(self, tag: str):
         """Remove a tag from this game object."""
+        if tag not in self.tags:
+            return
         self.tags.discard(tag)
+        if self.parent is not None:
+            by_tag = self.get_root()._by_tag
+            members = by_tag.get(tag)
+            if members is not None:
+                members.pop(self, None)
+                if not members:
+                    del by_tag[tag]
+        if self._manager is not None:
+            self._manager._unindex_tag(self, tag)
     
     def has_tag(self, tag: str) -> bool:
         """Check if this game object has a specific tag."""
@@ -600,42 +1185,54 @@ class GameObject(Value):
     
     def add_event_handler(self, event_type: str, handler):
         """Add an event handler for a specific event type."""
-        if event_type not in self.event_handlers:
-            self.event_handlers[event_type] = []
-        
         # Handler can be either a Python callable or an Engage Function
         if not (callable(handler) or isinstance(handler, (Function, BuiltInFunction))):
             raise TypeError("Event handler must be callable or an Engage Function")
         
+        if self.event_handlers is None:
+            self.event_handlers = {}
+        if event_type not in self.event_handlers:
+            self.event_handlers[event_type] = []
+            if self._manager is not None:
+                self._manager._index_handlers(self, event_type)
+        
         self.event_handlers[event_type].append(handler)
     
     def remove_event_handler(self, event_type: str, handler):
         """Remove a specific event handler."""
-        if event_type in self.event_handlers:
+        if self.event_handlers and event_type in self.event_handlers:
             try:
                 self.event_handlers[event_type].remove(handler)
                 if not self.event_handlers[event_type]:
                     del self.event_handlers[event_type]
+                    if self._manager is not None:
+                        self._manager._unindex_handlers(self, event_type)
             except ValueError:
                 pass  # Handler not found, ignore
     
     def clear_event_handlers(self, event_type: str = None):
         """Clear event handlers for a specific type or all types."""
-        if event_type:
-            self.event_handlers.pop(event_type, None)
-        else:
-            self.event_handlers.clear()
+        if not self.event_handlers:
+            return
+        event_types = [event_type] if event_type else list(self.event_handlers)
+        for cleared_type in event_types:
+            if self.event_handlers.pop(cleared_type, None) is not None and self._manager is not None:
+                self._manager._unindex_handlers(self, cleared_type)
+    
+    def has_event_handlers(self, event_type: str) -> bool:
+        """Check if any handler is registered for an event type."""
+        return bool(self.event_handlers and self.event_handlers.get(event_type))
     
     def trigger_event(self, event: GameEvent, context=None):
         """Trigger an event on this game object."""
-        if not self.active:
+        if not self._active:
             return False  # Inactive objects don't handle events
         
         event.source_object = self
         handled = False
         
         # Execute handlers for this event type
-        handlers = self.event_handlers.get(event.event_type, [])
+        handlers = self.event_handlers.get(event.event_type, ()) if self.event_handlers else ()
         for handler in handlers:
             try:
                 if isinstance(handler, (Function, BuiltInFunction)):
@@ -682,43 +1279,86 @@ class GameObject(Value):
     # --- Game Loop Integration ---
     
     def update(self, delta_time: float):
-        """Update the game object. Called every frame by the game loop."""
-        if not self.active or not self.update_enabled:
-            return
-        
+        """Update the game object and its children. Called every frame by the game loop."""
+        # Pre-order walk with an explicit stack instead of one Python frame per child
+        stack = [self]
+        while stack:
+            game_object = stack.pop()
+            if not game_object._active:
+                continue
+            if game_object is not self and type(game_object).update is not GameObject.update:
+                game_object.update(delta_time)  # Subclass override handles its own subtree
+                continue
+            if not game_object.update_enabled:
+                continue
+            
+            game_object._update_self(delta_time)
+            stack.extend(reversed(game_object.children))
+    
+    def _update_self(self, delta_time: float):
+        """Per-frame work for this object alone (children are handled by the caller)."""
         # Update sprite animation
         self.sprite.update_animation(delta_time)
         
-        # Trigger update event
-        event = GameEvent("update", self, {"delta_time": delta_time})
-        self.trigger_event(event)
-        
-        # Update children
-        for child in self.children:
-            if child.active:
-                child.update(delta_time)
+        self._fire_update_event(delta_time)
+    
+    def _fire_update_event(self, delta_time: float):
+        """Trigger this frame's update event."""
+        # Most objects have no update handler; skip building the event for them
+        if self.event_handlers and self.event_handlers.get("update"):
+            event = GameEvent("update", self, {"delta_time": delta_time})
+            self.trigger_event(event)
+    
+    @property
+    def render_order(self):
+        """Sort key of this object among the root objects rendered by its manager."""
+        return self._render_order
+    
+    @render_order.setter
+    def render_order(self, order):
+        self._render_order = order
+        if self._manager is not None:
+            self._manager._sorted_roots = None  # Re-sort on the next render_all
+    
+    def set_render_order(self, order):
+        """Set the sort key of this object among its manager's root objects."""
+        self.render_order = order
     
     def render(self, renderer=None):
-        """Render the game object. Called every frame by the game loop."""
-        if not self.active or not self.visible or not self.render_enabled:
-            return
-        
-        # Trigger render event
-        event = GameEvent("render", self, {"renderer": renderer})
-        self.trigger_event(event)
+        """Render the game object and its children. Called every frame by the game loop."""
+        stack = [self]
+        while stack:
+            game_object = stack.pop()
+            if not game_object._active or not game_object.visible:
+                continue
+            if game_object is not self and type(game_object).render is not GameObject.render:
+                game_object.render(renderer)  # Subclass override handles its own subtree
+                continue
+            if not game_object.render_enabled:
+                continue
+            
+            game_object._render_self(renderer)
+            stack.extend(reversed(game_object.children))
+    
+    def _render_self(self, renderer=None):
+        """Render this object alone (children are handled by the caller)."""
+        # Trigger render event (only built when a handler is listening)
+        if self.event_handlers and self.event_handlers.get("render"):
+            event = GameEvent("render", self, {"renderer": renderer})
+            self.trigger_event(event)
         
         # Render sprite if visible
         if self.sprite.visible and renderer:
-            render_data = self.prepare_render_data()
-            renderer.render_game_object(self, render_data)
+            render_record = getattr(renderer, 'render_record', None)
+            if render_record is not None:
+                # Renderers that accept flat records skip the nested dicts
+                render_record(self, self.prepare_render_record())
+            else:
+                render_data = self.prepare_render_data()
+                renderer.render_game_object(self, render_data)
         else:
             # Default console-based rendering for testing
             self._console_render()
-        
-        # Render children
-        for child in self.children:
-            if child.active and child.visible:
-                child.render(renderer)
     
     def prepare_render_data(self) -> Dict[str, Any]:
         """Prepare data needed for rendering this game object."""
@@ -757,6 +1397,21 @@ class GameObject(Value):
             'tags': list(self.tags)
         }
     
+    def prepare_render_record(self) -> RenderRecord:
+        """Prepare the data needed for rendering this game object as one flat RenderRecord."""
+        transform = self.transform
+        sprite = self.sprite
+        return RenderRecord(
+            self.object_type, self.object_id,
+            transform.x, transform.y, transform.rotation, transform.scale_x, transform.scale_y,
+            sprite.sprite_path, sprite.width, sprite.height, sprite.offset_x, sprite.offset_y,
+            sprite.tint_color, sprite.flip_horizontal, sprite.flip_vertical,
+            sprite.current_frame, sprite.frame_count,
+            self.collision_enabled, self.collision_width, self.collision_height,
+            self.collision_offset_x, self.collision_offset_y, self.is_trigger,
+            self.visible, self.active, tuple(self.tags)
+        )
+    
     def _console_render(self):
         """Basic console rendering for testing purposes."""
         indent = "  " * self._get_hierarchy_depth()
@@ -784,8 +1439,9 @@ class GameObject(Value):
         self.destroy_on_next_frame = True
         
         # Trigger destroy event
-        event = GameEvent("destroy", self)
-        self.trigger_event(event)
+        if self.has_event_handlers("destroy"):
+            event = GameEvent("destroy", self)
+            self.trigger_event(event)
         
         # Remove from parent
         if self.parent:
@@ -829,22 +1485,580 @@ class GameObject(Value):
         # Note: Event handlers and children are not copied to avoid complex reference issues
         
         return clone
+
+# --- Game Object Registry ---
+
+class GameObjectRegistry:
+    """
+    Mirrors the collision fields of many game objects into parallel arrays.
+    
+    Each registered object gets a dense index into structure-of-arrays columns
+    (position, scale, collision box, active/collision flags), kept up to date by write-through from
+    the object's setters. Broad-phase collision checks then run as whole-array
+    operations instead of one BoundingBox per object per check. Without numpy
+    the registry falls back to pairwise collides_with calls.
+    """
+    
+    # Column order of the mirrored fields
+    FIELDS = ('x', 'y', 'scale_x', 'scale_y',
+              'collision_width', 'collision_height', 'collision_offset_x', 'collision_offset_y',
+              'active', 'collision_enabled')
+    
+    # Average x-overlap candidates per object above which the grid is used
+    SWEEP_DENSITY_LIMIT = 32
+    
+    # Fewest animated sprites worth batching into arrays
+    BATCH_ANIMATION_MIN = 16
+    
+    # Per-object fields of gather_render_array (numpy dtype specs)
+    RENDER_FIELDS = (
+        ('x', 'f8'), ('y', 'f8'), ('rotation', 'f8'), ('scale_x', 'f8'), ('scale_y', 'f8'),
+        ('sprite_width', 'f8'), ('sprite_height', 'f8'), ('offset_x', 'f8'), ('offset_y', 'f8'),
+        ('tint_color', 'u1', (4,)), ('flip_horizontal', '?'), ('flip_vertical', '?'),
+        ('current_frame', 'i4'), ('frame_count', 'i4'),
+    )
+    
+    def __init__(self, capacity: int = 64):
+        self.objects = []  # dense index -> game_object
+        
+        # Pre-order traversal of the registered hierarchies, rebuilt on change:
+        # _flat_ends[i] is the position just past _flat_objects[i]'s subtree
+        self._flat_objects = []
+        self._flat_ends = []
+        self._flat_dirty = True
+        self._np = _import_numpy()
+        self._columns = None
+        self._sweep_order = None  # Registry indices sorted by left edge at the last broad phase
+        if self._np is not None:
+            # float64 so the edges match get_bounding_box bit for bit
+            self._columns = self._np.zeros((len(self.FIELDS), max(1, capacity)), dtype=self._np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.objects)
+    
+    def add(self, game_object: GameObject):
+        """Register a game object and mirror its fields."""
+        if game_object._registry is self:
+            return
+        if game_object._registry is not None:
+            game_object._registry.remove(game_object)
+        
+        game_object._registry = self
+        game_object._registry_index = len(self.objects)
+        self.objects.append(game_object)
+        self._flat_dirty = True
+        
+        if self._columns is not None and len(self.objects) > self._columns.shape[1]:
+            # Grow geometrically so appends stay amortized O(1)
+            grown = self._np.zeros((len(self.FIELDS), 2 * self._columns.shape[1]), dtype=self._np.float64)
+            grown[:, :self._columns.shape[1]] = self._columns
+            self._columns = grown
+        
+        self.sync(game_object)
+    
+    def remove(self, game_object: GameObject):
+        """Unregister a game object, moving the last object into its slot."""
+        if game_object._registry is not self:
+            return
+        
+        index = game_object._registry_index
+        last = self.objects.pop()
+        if last is not game_object:
+            self.objects[index] = last
+            last._registry_index = index
+            if self._columns is not None:
+                self._columns[:, index] = self._columns[:, len(self.objects)]
+        
+        game_object._registry = None
+        game_object._registry_index = -1
+        self._flat_dirty = True
+    
+    def sync(self, game_object: GameObject):
+        """Copy a game object's current fields into its column slot."""
+        if self._columns is None:
+            return
+        transform = game_object.transform
+        self._columns[:, game_object._registry_index] = (
+            transform._x, transform._y, transform._scale_x, transform._scale_y,
+            game_object._collision_width, game_object._collision_height,
+            game_object._collision_offset_x, game_object._collision_offset_y,
+            game_object._active, game_object._collision_enabled
+        )
+    
+    def _rebuild_flat(self):
+        """Flatten the hierarchies under the registered root objects, pre-order."""
+        flat_objects = []
+        flat_ends = []
+        stack = [root for root in reversed(self.objects) if root.parent is None]
+        while stack:
+            entry = stack.pop()
+            if type(entry) is int:
+                # Exit marker: everything since the entry belongs to that subtree
+                flat_ends[entry] = len(flat_objects)
+                continue
+            stack.append(len(flat_objects))
+            flat_objects.append(entry)
+            flat_ends.append(0)
+            stack.extend(reversed(entry.children))
+        
+        self._flat_objects = flat_objects
+        self._flat_ends = flat_ends
+        self._flat_dirty = False
+    
+    def update(self, delta_time: float):
+        """
+        Update every registered hierarchy in one flat loop.
+        
+        Equivalent to calling update on each registered root object, but walks a
+        cached pre-order list; a skipped object jumps past its whole subtree.
+        Which objects update is decided from their flags at the start of the
+        frame, then all sprite animations advance in one batch before the
+        update events fire in order.
+        """
+        if self._flat_dirty:
+            self._rebuild_flat()
+        flat_objects = self._flat_objects
+        flat_ends = self._flat_ends
+        
+        base_update = GameObject.update
+        updating = []
+        animated = []
+        position = 0
+        count = len(flat_objects)
+        while position < count:
+            game_object = flat_objects[position]
+            if not game_object._active:
+                position = flat_ends[position]
+            elif type(game_object).update is not base_update:
+                updating.append(game_object)  # Subclass override handles its own subtree
+                position = flat_ends[position]
+            elif not game_object.update_enabled:
+                position = flat_ends[position]
+            else:
+                updating.append(game_object)
+                sprite = game_object.sprite
+                if sprite.frame_count > 1 and sprite.animation_speed > 0:
+                    animated.append(sprite)
+                position += 1
+        
+        self.advance_animations(animated, delta_time)
+        
+        for game_object in updating:
+            if type(game_object).update is not base_update:
+                game_object.update(delta_time)
+            else:
+                game_object._fire_update_event(delta_time)
+    
+    def advance_animations(self, sprites: List[Sprite], delta_time: float):
+        """
+        Advance many sprite animations at once, like update_animation on each.
+        
+        The animation state is gathered into arrays, stepped with a few
+        whole-array operations and written back, instead of running each
+        sprite's frame loop in Python. Subtracting several frame durations at
+        once can round differently from one at a time, so a sprite sitting
+        exactly on a frame boundary may switch frames one update earlier or later.
+        """
+        np = self._np
+        if np is None or len(sprites) < self.BATCH_ANIMATION_MIN:
+            for sprite in sprites:
+                sprite.update_animation(delta_time)
+            return
+        
+        count = len(sprites)
+        times = np.fromiter((sprite.animation_time for sprite in sprites), dtype=np.float64, count=count)
+        speeds = np.fromiter((sprite.animation_speed for sprite in sprites), dtype=np.float64, count=count)
+        frame_counts = np.fromiter((sprite.frame_count for sprite in sprites), dtype=np.int64, count=count)
+        frames = np.fromiter((sprite.current_frame for sprite in sprites), dtype=np.int64, count=count)
+        loops = np.fromiter((sprite.loop_animation for sprite in sprites), dtype=bool, count=count)
+        
+        times += delta_time
+        durations = 1.0 / speeds
+        advances = np.floor(times / durations).astype(np.int64)
+        # A non-looping animation stops consuming time once it reaches its last frame
+        steps = np.where(loops, advances, np.minimum(advances, frame_counts - frames))
+        times -= steps * durations
+        frames = np.where(loops, (frames + advances) % frame_counts,
+                          np.minimum(frames + advances, frame_counts - 1))
+        
+        for sprite, animation_time, current_frame in zip(sprites, times.tolist(), frames.tolist()):
+            sprite.animation_time = animation_time
+            sprite.current_frame = current_frame
+    
+    def _collect_drawn(self, renderer=None, dispatch: bool = False) -> List[GameObject]:
+        """
+        The registered objects that draw a sprite this frame, in render order.
+        
+        Follows GameObject.render's rules on the cached pre-order list; objects
+        whose class overrides render are left out along with their subtree.
+        With dispatch, the per-object side effects of rendering happen along
+        the way: render events fire, overrides render their own subtree and
+        objects without a visible sprite fall back to console rendering.
+        """
+        if self._flat_dirty:
+            self._rebuild_flat()
+        flat_objects = self._flat_objects
+        flat_ends = self._flat_ends
+        
+        base_render = GameObject.render
+        drawn = []
+        position = 0
+        count = len(flat_objects)
+        while position < count:
+            game_object = flat_objects[position]
+            if not game_object._active or not game_object.visible:
+                position = flat_ends[position]
+                continue
+            if type(game_object).render is not base_render:
+                if dispatch:
+                    game_object.render(renderer)
+                position = flat_ends[position]
+                continue
+            if not game_object.render_enabled:
+                position = flat_ends[position]
+                continue
+            
+            if dispatch and game_object.event_handlers and game_object.event_handlers.get("render"):
+                game_object.trigger_event(GameEvent("render", game_object, {"renderer": renderer}))
+            if game_object.sprite.visible:
+                drawn.append(game_object)
+            elif dispatch:
+                game_object._console_render()
+            position += 1
+        return drawn
+    
+    def gather_render_array(self):
+        """
+        Gather the render data of every drawn object into one structured array.
+        
+        Returns:
+            (records, objects): a numpy array with RENDER_FIELDS, one row per
+            object in render order, and the matching list of game objects (for
+            sprite paths and ids); None when numpy is not installed
+        """
+        np = self._np
+        if np is None:
+            return None
+        
+        objects = self._collect_drawn()
+        return self._gather_render_records(objects), objects
+    
+    def _gather_render_records(self, objects: List[GameObject]):
+        """Fill a RENDER_FIELDS structured array from the given objects."""
+        np = self._np
+        count = len(objects)
+        records = np.zeros(count, dtype=list(self.RENDER_FIELDS))
+        if count == 0:
+            return records
+        
+        transforms = [game_object.transform for game_object in objects]
+        sprites = [game_object.sprite for game_object in objects]
+        # Children need not be registered themselves, so read the transforms
+        # rather than the columns
+        records['x'] = np.fromiter((transform.x for transform in transforms), dtype=np.float64, count=count)
+        records['y'] = np.fromiter((transform.y for transform in transforms), dtype=np.float64, count=count)
+        records['scale_x'] = np.fromiter((transform.scale_x for transform in transforms), dtype=np.float64, count=count)
+        records['scale_y'] = np.fromiter((transform.scale_y for transform in transforms), dtype=np.float64, count=count)
+        records['rotation'] = np.fromiter((transform.rotation for transform in transforms), dtype=np.float64, count=count)
+        records['sprite_width'] = np.fromiter((sprite.width for sprite in sprites), dtype=np.float64, count=count)
+        records['sprite_height'] = np.fromiter((sprite.height for sprite in sprites), dtype=np.float64, count=count)
+        records['offset_x'] = np.fromiter((sprite.offset_x for sprite in sprites), dtype=np.float64, count=count)
+        records['offset_y'] = np.fromiter((sprite.offset_y for sprite in sprites), dtype=np.float64, count=count)
+        records['tint_color'] = [sprite.tint_color for sprite in sprites]
+        records['flip_horizontal'] = np.fromiter((sprite.flip_horizontal for sprite in sprites), dtype=bool, count=count)
+        records['flip_vertical'] = np.fromiter((sprite.flip_vertical for sprite in sprites), dtype=bool, count=count)
+        records['current_frame'] = np.fromiter((sprite.current_frame for sprite in sprites), dtype=np.int32, count=count)
+        records['frame_count'] = np.fromiter((sprite.frame_count for sprite in sprites), dtype=np.int32, count=count)
+        return records
+    
+    def render(self, renderer=None):
+        """
+        Render every registered hierarchy, batching sprites by texture.
+        
+        When the renderer provides draw_batch(sprite_path, records, objects),
+        the drawn objects are gathered into one structured array (see
+        gather_render_array) and submitted with one call per sprite path,
+        in the order each path first appears; within a batch, render order
+        is kept. Otherwise, or without numpy, each registered root object is
+        rendered as usual.
+        """
+        draw_batch = getattr(renderer, 'draw_batch', None) if renderer else None
+        if draw_batch is None or self._np is None:
+            for game_object in list(self.objects):
+                if game_object.parent is None:
+                    game_object.render(renderer)
+            return
+        
+        np = self._np
+        objects = self._collect_drawn(renderer, dispatch=True)
+        if not objects:
+            return
+        records = self._gather_render_records(objects)
+        
+        # Number the paths by first appearance; a stable sort on those numbers
+        # groups each texture while keeping render order inside the group
+        path_numbers = {}
+        paths = [game_object.sprite.sprite_path for game_object in objects]
+        numbers = np.fromiter((path_numbers.setdefault(path, len(path_numbers)) for path in paths),
+                              dtype=np.intp, count=len(paths))
+        order = np.argsort(numbers, kind='stable')
+        bounds = np.searchsorted(numbers[order], np.arange(len(path_numbers) + 1))
+        for path, number in path_numbers.items():
+            batch = order[bounds[number]:bounds[number + 1]]
+            draw_batch(path, records[batch], [objects[index] for index in batch.tolist()])
+    
+    def get_edges(self):
+        """
+        Compute every registered object's collision box edges at once.
+        
+        Returns:
+            Arrays (lefts, rights, tops, bottoms), indexed like self.objects
+        """
+        count = len(self.objects)
+        x, y, scale_x, scale_y, width, height, offset_x, offset_y = self._columns[:8, :count]
+        widths = width * scale_x
+        heights = height * scale_y
+        lefts = x + offset_x - widths / 2
+        tops = y + offset_y - heights / 2
+        return lefts, lefts + widths, tops, tops + heights
+    
+    def find_in_radius(self, center_x: float, center_y: float, radius: float) -> List[GameObject]:
+        """
+        Find the active registered objects whose position is within radius of a point.
+        
+        Returns:
+            Matching game objects, in registry order
+        """
+        np = self._np
+        count = len(self.objects)
+        x, y = self._columns[:2, :count]
+        dx = x - center_x
+        dy = y - center_y
+        hits = np.flatnonzero((dx * dx + dy * dy <= radius * radius) & (self._columns[8, :count] != 0))
+        return list(map(self.objects.__getitem__, hits.tolist()))
+    
+    def find_in_area(self, x: float, y: float, width: float, height: float) -> List[GameObject]:
+        """
+        Find the active, collidable registered objects whose box overlaps a rectangle.
+        
+        Uses the same strict test as BoundingBox.intersects.
+        
+        Returns:
+            Matching game objects, in registry order
+        """
+        np = self._np
+        lefts, rights, tops, bottoms = self.get_edges()
+        hits = np.flatnonzero((lefts < x + width) & (x < rights) & (tops < y + height) & (y < bottoms)
+                              & self._collidable_mask())
+        return list(map(self.objects.__getitem__, hits.tolist()))
+    
+    def find_nearest(self, x: float, y: float, max_distance: float = float('inf'),
+                     exclude_object: GameObject = None, tag_filter: str = None) -> Optional[GameObject]:
+        """
+        Find the nearest active registered object to a point.
+        
+        Compares squared distances. Without a tag filter this is one argmin;
+        with one, objects closer than max_distance are tried in order of
+        distance until one has the tag. Ties go to registry order.
+        """
+        np = self._np
+        count = len(self.objects)
+        limit = max_distance * max_distance if max_distance >= 0 else -1.0
+        px, py = self._columns[:2, :count]
+        dx = px - x
+        dy = py - y
+        distances = dx * dx + dy * dy
+        eligible = (distances < limit) & (self._columns[8, :count] != 0)
+        if exclude_object is not None and exclude_object._registry is self:
+            eligible[exclude_object._registry_index] = False
+        objects = self.objects
+        
+        if not tag_filter:
+            # Squared distances order like distances; argmin takes the first of any ties
+            if not eligible.any():
+                return None
+            return objects[int(np.argmin(np.where(eligible, distances, np.inf)))]
+        
+        candidates = np.flatnonzero(eligible)
+        for index in candidates[np.argsort(distances[candidates], kind='stable')].tolist():
+            game_object = objects[index]
+            if tag_filter in game_object.tags:
+                return game_object
+        return None
+    
+    def _collidable_mask(self):
+        """Boolean array of objects that currently take part in collisions."""
+        active, collision_enabled = self._columns[8:10, :len(self.objects)]
+        return (active != 0) & (collision_enabled != 0)
+    
+    def find_overlapping_pairs(self) -> List[Tuple[GameObject, GameObject]]:
+        """
+        Find every pair of registered objects whose collision boxes overlap.
+        
+        Gives the same pairs as calling collides_with on every combination.
+        
+        Returns:
+            List of (object_a, object_b) pairs, object_a registered first
+        """
+        objects = self.objects
+        if self._columns is None:
+            return [(objects[i], objects[j])
+                    for i in range(len(objects))
+                    for j in range(i + 1, len(objects))
+                    if objects[i].collides_with(objects[j])]
+        
+        np = self._np
+        indices = np.flatnonzero(self._collidable_mask())
+        lefts, rights, tops, bottoms = (edge[indices] for edge in self.get_edges())
+        
+        order = self._sort_by_left(indices, lefts)
+        kernel = _get_overlap_kernel()
+        if kernel is not None:
+            first, second = kernel(order, lefts, rights, tops, bottoms)
+        else:
+            first, second = self._sweep_candidates(lefts, rights, order)
+            if first is None:
+                first, second = self._grid_candidates(lefts, rights, tops, bottoms)
+            
+            # Exact AABB test on the surviving candidates
+            hits = ((lefts[first] < rights[second]) & (lefts[second] < rights[first]) &
+                    (tops[first] < bottoms[second]) & (tops[second] < bottoms[first]))
+            first = first[hits]
+            second = second[hits]
+        
+        first = indices[first]
+        second = indices[second]
+        pairs_a = np.minimum(first, second)
+        pairs_b = np.maximum(first, second)
+        order = np.lexsort((pairs_b, pairs_a))
+        
+        return [(objects[a], objects[b])
+                for a, b in zip(pairs_a[order].tolist(), pairs_b[order].tolist())]
+    
+    def _sort_by_left(self, indices, lefts):
+        """
+        Sort the broad-phase boxes by left edge, starting from the last order.
+        
+        Objects move little between frames, so last frame's order (mapped to
+        this frame's boxes, new boxes appended) is nearly sorted already and
+        the stable sort (timsort) finishes in close to linear time.
+        
+        Args:
+            indices: Registry indices of the boxes
+            lefts: Their left edges
+        
+        Returns:
+            Positions into lefts, in ascending order of left edge
+        """
+        np = self._np
+        count = len(indices)
+        previous = self._sweep_order
+        if previous is None:
+            start = np.arange(count)
+        else:
+            position_of = np.full(len(self.objects), -1, dtype=np.intp)
+            position_of[indices] = np.arange(count)
+            start = position_of[previous[previous < len(self.objects)]]
+            start = start[start >= 0]
+            seen = np.zeros(count, dtype=bool)
+            seen[start] = True
+            start = np.concatenate((start, np.flatnonzero(~seen)))
+        
+        order = start[np.argsort(lefts[start], kind='stable')]
+        self._sweep_order = indices[order]
+        return order
+    
+    def _sweep_candidates(self, lefts, rights, order):
+        """
+        Sweep-and-prune along x: candidate pairs whose x-spans overlap.
+        
+        After sorting by left edge, the partners of each box are exactly the
+        boxes that start inside its span, found with one binary search each.
+        
+        Args:
+            lefts, rights: Box edges along x
+            order: Positions into lefts in ascending order (see _sort_by_left)
+        
+        Returns:
+            Arrays (first, second) of positions into lefts, or (None, None)
+            when the boxes are too crowded along x for the sweep to prune well
+        """
+        np = self._np
+        count = len(lefts)
+        ends = np.searchsorted(lefts[order], rights[order], side='right')
+        positions = np.arange(count)
+        counts = np.maximum(ends - positions - 1, 0)
+        total = int(counts.sum())
+        if total > self.SWEEP_DENSITY_LIMIT * count:
+            return None, None
+        
+        # Expand each box's run of partners: box k pairs with k+1 .. k+counts[k]
+        owners = np.repeat(positions, counts)
+        steps = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return order[owners], order[owners + 1 + steps]
+    
+    def _grid_candidates(self, lefts, rights, tops, bottoms):
+        """
+        Uniform-grid candidate pairs for scenes too dense for the sweep.
+        
+        Returns:
+            Arrays (first, second) of positions into lefts
+        """
+        np = self._np
+        low_x, high_x = np.minimum(lefts, rights), np.maximum(lefts, rights)
+        low_y, high_y = np.minimum(tops, bottoms), np.maximum(tops, bottoms)
+        cell_size = max(float(np.mean(high_x - low_x)), float(np.mean(high_y - low_y)), 1e-9)
+        
+        cells = {}  # (cell_x, cell_y) -> positions of boxes touching that cell
+        spans = zip((low_x // cell_size).astype(np.int64).tolist(), (high_x // cell_size).astype(np.int64).tolist(),
+                    (low_y // cell_size).astype(np.int64).tolist(), (high_y // cell_size).astype(np.int64).tolist())
+        for position, (min_x, max_x, min_y, max_y) in enumerate(spans):
+            for cell_x in range(min_x, max_x + 1):
+                for cell_y in range(min_y, max_y + 1):
+                    cells.setdefault((cell_x, cell_y), []).append(position)
+        
+        candidates = set()
+        for members in cells.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    candidates.add((a, b))
+        
+        if not candidates:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        first, second = np.array(list(candidates), dtype=np.int64).T
+        return first, second
+
 # --- Game Object Manager ---
 
 class GameObjectManager:
     """Manages the lifecycle and interactions of game objects."""
     
+    # Spatial hash keys are masked to this many bits' worth of buckets
+    GRID_HASH_MASK = 0xFFFF
+    
+    # Fewest objects for which queries and the broad phase run on the registry's arrays
+    VECTORIZED_QUERY_MIN = 32
+    
     def __init__(self):
         self.objects = {}  # object_id -> game_object
         self.objects_by_tag = {}  # tag -> set of game_objects
+        self._handlers_by_event = {}  # event_type -> {game_object: None} with handlers for it, for broadcasts
         self.root_objects = []  # Objects without parents
+        self._root_index = {}  # game_object -> position in root_objects
+        self._sorted_roots = None  # root_objects by render_order; None when it must be re-sorted
         self.collision_pairs = []  # Pairs of objects that can collide
-        self.event_queue = []
+        self.event_queue = deque()  # FIFO; popleft is O(1)
         self.renderer = None
         
         # Performance optimization
-        self.spatial_grid = {}  # Simple spatial partitioning for collision detection
+        self.registry = GameObjectRegistry()  # Position/collision arrays for area queries
+        self.spatial_grid = {}  # Hashed cell key -> list of game_objects, for collision detection
         self.grid_size = 100  # Size of each grid cell
+        self._pair_pass = 0  # Number of the current broad-phase pass (see _find_potential_collision_pairs)
+        # Broad phase for check_collisions: "grid" (spatial hash), "sweep" (the
+        # registry's sort-and-sweep) or "auto" (sweep once there are enough objects)
+        self.broadphase_mode = "auto"
         
         # Game loop timing
         self.last_update_time = 0.0
@@ -853,16 +2067,23 @@ class GameObjectManager:
     
     def register_object(self, game_object: GameObject):
         """Register a game object with the manager."""
+        _settle_id_clash(self.objects, game_object)
         self.objects[game_object.object_id] = game_object
         
-        if not game_object.parent:
+        if not game_object.parent and game_object not in self._root_index:
+            self._root_index[game_object] = len(self.root_objects)
             self.root_objects.append(game_object)
+            self._sorted_roots = None
         
-        # Add to tag index
+        # Add to tag index (kept current by add_tag/remove_tag from now on)
+        game_object._manager = self
         for tag in game_object.tags:
-            if tag not in self.objects_by_tag:
-                self.objects_by_tag[tag] = set()
-            self.objects_by_tag[tag].add(game_object)
+            self._index_tag(game_object, tag)
+        if game_object.event_handlers:
+            for event_type in game_object.event_handlers:
+                self._index_handlers(game_object, event_type)
+        
+        self.registry.add(game_object)
         
         # Update spatial grid
         self._update_spatial_grid(game_object)
@@ -872,37 +2093,107 @@ class GameObjectManager:
         if game_object.object_id in self.objects:
             del self.objects[game_object.object_id]
         
-        if game_object in self.root_objects:
-            self.root_objects.remove(game_object)
+        index = self._root_index.pop(game_object, None)
+        if index is not None:
+            # Swap-pop: move the last root into the freed slot
+            last = self.root_objects.pop()
+            if index < len(self.root_objects):
+                self.root_objects[index] = last
+                self._root_index[last] = index
+            self._sorted_roots = None
         
         # Remove from tag index
         for tag in game_object.tags:
-            if tag in self.objects_by_tag:
-                self.objects_by_tag[tag].discard(game_object)
-                if not self.objects_by_tag[tag]:
-                    del self.objects_by_tag[tag]
+            self._unindex_tag(game_object, tag)
+        if game_object.event_handlers:
+            for event_type in game_object.event_handlers:
+                self._unindex_handlers(game_object, event_type)
+        if game_object._manager is self:
+            game_object._manager = None
         
         # Remove from parent if it has one
         if game_object.parent:
             game_object.parent.remove_child(game_object)
         
+        self.registry.remove(game_object)
+        
         # Remove from spatial grid
         self._remove_from_spatial_grid(game_object)
     
+    def _index_tag(self, game_object: GameObject, tag: str):
+        """Add a game object to the tag index under one tag."""
+        members = self.objects_by_tag.get(tag)
+        if members is None:
+            members = self.objects_by_tag[tag] = set()
+        members.add(game_object)
+    
+    def _unindex_tag(self, game_object: GameObject, tag: str):
+        """Remove a game object from the tag index under one tag."""
+        members = self.objects_by_tag.get(tag)
+        if members is not None:
+            members.discard(game_object)
+            if not members:
+                del self.objects_by_tag[tag]
+    
+    def _index_handlers(self, game_object: GameObject, event_type: str):
+        """Record that a game object handles an event type (for broadcasts)."""
+        members = self._handlers_by_event.get(event_type)
+        if members is None:
+            members = self._handlers_by_event[event_type] = {}
+        members[game_object] = None
+    
+    def _unindex_handlers(self, game_object: GameObject, event_type: str):
+        """Forget that a game object handles an event type."""
+        members = self._handlers_by_event.get(event_type)
+        if members is not None:
+            members.pop(game_object, None)
+            if not members:
+                del self._handlers_by_event[event_type]
+    
     def get_object(self, object_id: str) -> Optional[GameObject]:
         """Get a game object by its ID."""
         return self.objects.get(object_id)
     
     def get_objects_by_tag(self, tag: str) -> List[GameObject]:
         """Get all game objects with a specific tag."""
-        return list(self.objects_by_tag.get(tag, set()))
+        return list(self.objects_by_tag.get(tag, ()))
+    
+    def iter_objects_by_tag(self, tag: str):
+        """
+        Iterate over the game objects with a specific tag without copying them.
+        
+        Returns:
+            The manager's own index set (or an empty tuple); it must not be
+            modified, nor tags changed, while iterating
+        """
+        return self.objects_by_tag.get(tag, ())
     
     def get_objects_by_type(self, object_type: str) -> List[GameObject]:
         """Get all game objects of a specific type."""
         return [obj for obj in self.objects.values() if obj.object_type == object_type]
     
+    def _use_vectorized_queries(self) -> bool:
+        """Whether queries and the broad phase can run on the registry's arrays."""
+        registry = self.registry
+        # The registry must mirror exactly the managed objects (an object
+        # moved into another registry drops out of this one)
+        return (registry._columns is not None and len(registry) == len(self.objects)
+                and len(registry) >= self.VECTORIZED_QUERY_MIN)
+    
+    def _use_sweep_broadphase(self) -> bool:
+        """Whether check_collisions takes its pairs from the registry's sweep."""
+        mode = self.broadphase_mode
+        if mode == "grid":
+            return False
+        if mode == "sweep":
+            return self.registry._columns is not None and len(self.registry) == len(self.objects)
+        return self._use_vectorized_queries()
+    
     def find_objects_in_area(self, x: float, y: float, width: float, height: float) -> List[GameObject]:
         """Find all game objects within a rectangular area."""
+        if self._use_vectorized_queries():
+            return self.registry.find_in_area(x, y, width, height)
+        
         area_bbox = BoundingBox(x, y, width, height)
         results = []
         
@@ -918,6 +2209,9 @@ class GameObjectManager:
     
     def find_objects_in_radius(self, center_x: float, center_y: float, radius: float) -> List[GameObject]:
         """Find all game objects within a circular area."""
+        if self._use_vectorized_queries():
+            return self.registry.find_in_radius(center_x, center_y, radius)
+        
         results = []
         radius_squared = radius * radius
         
@@ -937,89 +2231,154 @@ class GameObjectManager:
     def find_nearest_object(self, x: float, y: float, max_distance: float = float('inf'), 
                            exclude_object: GameObject = None, tag_filter: str = None) -> Optional[GameObject]:
         """Find the nearest game object to a point."""
+        if self._use_vectorized_queries():
+            return self.registry.find_nearest(x, y, max_distance, exclude_object, tag_filter)
+        
         nearest = None
-        nearest_distance = max_distance
+        # Compare squared distances; sqrt is monotonic so the order is the same
+        nearest_distance_squared = max_distance * max_distance if max_distance >= 0 else -1.0
         
-        for game_object in self.objects.values():
+        # With a tag filter only that tag's bucket needs scanning
+        candidates = self.objects_by_tag.get(tag_filter, ()) if tag_filter else self.objects.values()
+        for game_object in candidates:
             if not game_object.active or game_object == exclude_object:
                 continue
             
-            if tag_filter and tag_filter not in game_object.tags:
-                continue
-            
             dx = game_object.transform.x - x
             dy = game_object.transform.y - y
-            distance = math.sqrt(dx * dx + dy * dy)
+            distance_squared = dx * dx + dy * dy
             
-            if distance < nearest_distance:
+            if distance_squared < nearest_distance_squared:
                 nearest = game_object
-                nearest_distance = distance
+                nearest_distance_squared = distance_squared
         
         return nearest
     
     def _update_spatial_grid(self, game_object: GameObject):
         """Update the spatial grid for collision optimization."""
-        if not game_object.collision_enabled:
-            return
-        
-        bbox = game_object.get_bounding_box()
-        if not bbox:
+        game_object._grid_dirty = False
+        if not game_object._collision_enabled:
+            if game_object._grid_cells:
+                self._remove_from_spatial_grid(game_object)
             return
         
         # Calculate grid cells this object occupies
-        min_grid_x = int(bbox.left // self.grid_size)
-        max_grid_x = int(bbox.right // self.grid_size)
-        min_grid_y = int(bbox.top // self.grid_size)
-        max_grid_y = int(bbox.bottom // self.grid_size)
-        
-        # Add to grid cells
-        for grid_x in range(min_grid_x, max_grid_x + 1):
-            for grid_y in range(min_grid_y, max_grid_y + 1):
-                grid_key = (grid_x, grid_y)
-                if grid_key not in self.spatial_grid:
-                    self.spatial_grid[grid_key] = set()
-                self.spatial_grid[grid_key].add(game_object)
+        left, top, right, bottom = game_object.get_bbox_tuple()
+        grid_size = self.grid_size
+        grid_range = (int(left // grid_size), int(right // grid_size),
+                      int(top // grid_size), int(bottom // grid_size))
+        if grid_range == game_object._grid_range:
+            return  # Still covers the same cells
+        
+        # Move from the old cells to the new ones
+        self._remove_from_spatial_grid(game_object)
+        min_grid_x, max_grid_x, min_grid_y, max_grid_y = grid_range
+        # Cells are hashed to one int key (Teschner et al.), not a tuple; cells
+        # sharing a bucket only add candidates that the narrow phase rejects.
+        # Duplicate keys are dropped so an object is never listed twice in a bucket
+        hash_mask = self.GRID_HASH_MASK
+        grid_cells = tuple(dict.fromkeys(
+            ((grid_x * 73856093) ^ (grid_y * 19349663)) & hash_mask
+            for grid_x in range(min_grid_x, max_grid_x + 1)
+            for grid_y in range(min_grid_y, max_grid_y + 1)
+        ))
+        spatial_grid = self.spatial_grid
+        for grid_key in grid_cells:
+            grid_cell = spatial_grid.get(grid_key)
+            if grid_cell is None:
+                spatial_grid[grid_key] = [game_object]
+            else:
+                grid_cell.append(game_object)
+        
+        game_object._grid_cells = grid_cells
+        game_object._grid_range = grid_range
     
     def _remove_from_spatial_grid(self, game_object: GameObject):
         """Remove a game object from the spatial grid."""
-        # Remove from all grid cells (inefficient but simple)
-        for grid_cell in self.spatial_grid.values():
-            grid_cell.discard(game_object)
-    
-    def _get_potential_collision_pairs(self) -> List[Tuple[GameObject, GameObject]]:
-        """Get pairs of objects that might collide using spatial partitioning."""
-        pairs = set()
+        # Only the cells recorded on the object can hold it
+        spatial_grid = self.spatial_grid
+        for grid_key in game_object._grid_cells:
+            grid_cell = spatial_grid.get(grid_key)
+            if grid_cell is not None:
+                grid_cell.remove(game_object)
+                if not grid_cell:
+                    del spatial_grid[grid_key]
+        
+        game_object._grid_cells = ()
+        game_object._grid_range = None
+    
+    def _find_potential_collision_pairs(self) -> List[Tuple[GameObject, GameObject]]:
+        """
+        Find pairs of objects that might collide using spatial partitioning.
+        
+        Objects sharing several cells are deduplicated through a partner set on
+        the one with the lower _int_id, stamped with this pass's number and
+        replaced on first use in a new pass.
+        
+        Returns:
+            List of (object_a, object_b) pairs, object_a registered first, sorted
+            by registry index like find_overlapping_pairs
+        """
+        self._pair_pass += 1
+        pair_pass = self._pair_pass
+        pairs = []
         
         for grid_cell in self.spatial_grid.values():
-            objects_in_cell = list(grid_cell)
+            objects_in_cell = [obj for obj in grid_cell if obj._active and obj._collision_enabled]
             for i in range(len(objects_in_cell)):
+                obj_i = objects_in_cell[i]
                 for j in range(i + 1, len(objects_in_cell)):
-                    obj_a, obj_b = objects_in_cell[i], objects_in_cell[j]
-                    if obj_a.active and obj_b.active and obj_a.collision_enabled and obj_b.collision_enabled:
-                        pairs.add((obj_a, obj_b))
-        
-        return list(pairs)
+                    obj_a, obj_b = obj_i, objects_in_cell[j]
+                    if obj_b._int_id < obj_a._int_id:
+                        obj_a, obj_b = obj_b, obj_a
+                    if obj_a._pair_pass != pair_pass:
+                        obj_a._pair_pass = pair_pass
+                        obj_a._pair_partners = set()
+                    elif obj_b._int_id in obj_a._pair_partners:
+                        continue
+                    obj_a._pair_partners.add(obj_b._int_id)
+                    if obj_b._registry_index < obj_a._registry_index:
+                        obj_a, obj_b = obj_b, obj_a
+                    pairs.append((obj_a, obj_b))
+        
+        # Cell order follows whichever object first touched each cell, so
+        # handlers would otherwise fire in a different order than on the sweep
+        pairs.sort(key=lambda pair: (pair[0]._registry_index, pair[1]._registry_index))
+        return pairs
     
     def check_collisions(self, context=None):
         """Check for collisions between all game objects."""
-        collision_pairs = self._get_potential_collision_pairs()
+        if self._use_sweep_broadphase():
+            # Broad phase over the registry's edge arrays (numba kernel when
+            # available); its pairs already passed a whole-array AABB test
+            collision_pairs = self.registry.find_overlapping_pairs()
+            exact = True
+        else:
+            collision_pairs = self._find_potential_collision_pairs()
+            exact = False
         
         for obj_a, obj_b in collision_pairs:
-            if obj_a.collides_with(obj_b):
-                collision_info = obj_a.get_collision_info(obj_b)
-                
-                # Trigger collision events
-                event_a = GameEvent("collision", obj_a, {
+            # Nothing to build when neither side listens for collisions
+            if not obj_a.has_event_handlers("collision") and not obj_b.has_event_handlers("collision"):
+                continue
+            # Exact pairs only need re-checking once a handler has run, since
+            # handlers may move or disable objects
+            if not exact and not obj_a.collides_with(obj_b):
+                continue
+            collision_info = obj_a.get_collision_info(obj_b)
+            exact = False
+            
+            # Trigger collision events on the sides that listen for them
+            if obj_a.has_event_handlers("collision"):
+                obj_a.trigger_event(GameEvent("collision", obj_a, {
                     "other_object": obj_b,
                     "collision_info": collision_info
-                })
-                event_b = GameEvent("collision", obj_b, {
+                }), context)
+            if obj_b.has_event_handlers("collision"):
+                obj_b.trigger_event(GameEvent("collision", obj_b, {
                     "other_object": obj_a,
                     "collision_info": collision_info
-                })
-                
-                obj_a.trigger_event(event_a, context)
-                obj_b.trigger_event(event_b, context)
+                }), context)
     
     def queue_event(self, event: GameEvent):
         """Queue an event for processing."""
@@ -1028,14 +2387,15 @@ class GameObjectManager:
     def process_events(self, context=None):
         """Process all queued events."""
         while self.event_queue:
-            event = self.event_queue.pop(0)
+            event = self.event_queue.popleft()
             
             if event.source_object:
                 event.source_object.trigger_event(event, context)
             else:
-                # Broadcast event to all objects
-                for game_object in self.objects.values():
-                    if game_object.active:
+                # Broadcast event to the objects with handlers for it (the
+                # others would ignore it); copied since handlers may add handlers
+                for game_object in tuple(self._handlers_by_event.get(event.event_type, ())):
+                    if game_object._active:
                         game_object.trigger_event(event, context)
                         if event.handled:
                             break
@@ -1047,9 +2407,10 @@ class GameObjectManager:
             if root_object.active:
                 root_object.update(delta_time)
         
-        # Update spatial grid for moved objects
+        # Update spatial grid for objects moved, resized or toggled since they
+        # were last gridded (static objects are never re-gridded)
         for game_object in self.objects.values():
-            if game_object.active:
+            if game_object._grid_dirty and game_object._active and game_object.motion_type != "static":
                 self._update_spatial_grid(game_object)
         
         # Check collisions
@@ -1065,8 +2426,11 @@ class GameObjectManager:
     
     def render_all(self):
         """Render all game objects."""
-        # Sort root objects by render order (could be based on z-order, layer, etc.)
-        sorted_roots = sorted(self.root_objects, key=lambda obj: getattr(obj, 'render_order', 0))
+        # Sort root objects by render order (could be based on z-order, layer, etc.);
+        # the sorted list is kept until a root or a render_order changes
+        sorted_roots = self._sorted_roots
+        if sorted_roots is None:
+            sorted_roots = self._sorted_roots = sorted(self.root_objects, key=attrgetter('render_order'))
         
         for root_object in sorted_roots:
             if root_object.active and root_object.visible:
@@ -1074,10 +2438,35 @@ class GameObjectManager:
     
     def _cleanup_destroyed_objects(self):
         """Remove objects marked for destruction."""
-        destroyed_objects = [obj for obj in self.objects.values() if obj.is_destroyed()]
+        destroyed_objects = [obj for obj in self.objects.values() if obj.destroy_on_next_frame]
+        if len(destroyed_objects) * 2 <= len(self.objects):
+            for obj in destroyed_objects:
+                self.unregister_object(obj)
+            return
         
+        # Most objects died this frame: detach them, then rebuild the object,
+        # root and tag indexes from the survivors in one pass each
         for obj in destroyed_objects:
-            self.unregister_object(obj)
+            if obj.parent:
+                obj.parent.remove_child(obj)
+            if obj._manager is self:
+                obj._manager = None
+            self.registry.remove(obj)
+            self._remove_from_spatial_grid(obj)
+        
+        self.objects = {object_id: obj for object_id, obj in self.objects.items()
+                        if not obj.destroy_on_next_frame}
+        self.root_objects = [obj for obj in self.root_objects if not obj.destroy_on_next_frame]
+        self._root_index = {obj: index for index, obj in enumerate(self.root_objects)}
+        self._sorted_roots = None
+        self.objects_by_tag = {}
+        self._handlers_by_event = {}
+        for obj in self.objects.values():
+            for tag in obj.tags:
+                self._index_tag(obj, tag)
+            if obj.event_handlers:
+                for event_type in obj.event_handlers:
+                    self._index_handlers(obj, event_type)
     
     def set_renderer(self, renderer):
         """Set the renderer for all game objects."""
@@ -1098,7 +2487,10 @@ class GameObjectManager:
         
         self.objects.clear()
         self.objects_by_tag.clear()
+        self._handlers_by_event.clear()
         self.root_objects.clear()
+        self._root_index.clear()
+        self._sorted_roots = None
         self.spatial_grid.clear()
         self.event_queue.clear()
         self.frame_count = 0
@@ -1108,6 +2500,10 @@ class GameObjectManager:
 class GameLoop:
     """Basic game loop implementation for Engage games."""
     
+    # The frame limiter sleeps until this many seconds before the deadline and
+    # spins for the rest, since sleep can overshoot by a scheduler tick
+    FRAME_SPIN_MARGIN = 0.001
+    
     def __init__(self, game_manager: GameObjectManager):
         self.game_manager = game_manager
         self.running = False
@@ -1127,6 +2523,9 @@ class GameLoop:
         self.post_update_hooks = []
         self.pre_render_hooks = []
         self.post_render_hooks = []
+        # When True, a hook that raises is reported and the remaining hooks still
+        # run; when False, hooks are called bare and errors propagate
+        self.safe_mode = True
     
     def add_pre_update_hook(self, hook_function):
         """Add a function to be called before each update."""
@@ -1180,45 +2579,51 @@ class GameLoop:
     def update(self):
         """Update game state."""
         # Execute pre-update hooks
-        for hook in self.pre_update_hooks:
-            try:
-                hook(self.delta_time)
-            except Exception as e:
-                print(f"Error in pre-update hook: {e}")
+        if self.pre_update_hooks:
+            self._run_hooks(self.pre_update_hooks, "pre-update", self.delta_time)
         
         # Update game objects
         self.game_manager.update_all(self.delta_time)
         
         # Execute post-update hooks
-        for hook in self.post_update_hooks:
-            try:
-                hook(self.delta_time)
-            except Exception as e:
-                print(f"Error in post-update hook: {e}")
+        if self.post_update_hooks:
+            self._run_hooks(self.post_update_hooks, "post-update", self.delta_time)
     
     def render(self):
         """Render game state."""
         # Execute pre-render hooks
-        for hook in self.pre_render_hooks:
-            try:
-                hook()
-            except Exception as e:
-                print(f"Error in pre-render hook: {e}")
+        if self.pre_render_hooks:
+            self._run_hooks(self.pre_render_hooks, "pre-render")
         
         # Render game objects
         self.game_manager.render_all()
         
         # Execute post-render hooks
-        for hook in self.post_render_hooks:
+        if self.post_render_hooks:
+            self._run_hooks(self.post_render_hooks, "post-render")
+    
+    def _run_hooks(self, hooks: List[Callable], phase: str, *args):
+        """Call each hook with args, reporting errors per hook in safe mode."""
+        if not self.safe_mode:
+            for hook in hooks:
+                hook(*args)
+            return
+        
+        # One try around the whole run; after a failure, resume with the next hook
+        start = 0
+        while start < len(hooks):
+            index = start
             try:
-                hook()
+                for index in range(start, len(hooks)):
+                    hooks[index](*args)
+                return
             except Exception as e:
-                print(f"Error in post-render hook: {e}")
+                print(f"Error in {phase} hook: {e}")
+                start = index + 1
     
     def _get_time(self) -> float:
-        """Get current time in seconds."""
-        import time
-        return time.time()
+        """Get current time in seconds (monotonic, high resolution)."""
+        return perf_counter()
     
     def _update_fps_counter(self):
         """Update FPS counter."""
@@ -1235,12 +2640,13 @@ class GameLoop:
         if self.target_fps <= 0:
             return
         
-        target_frame_time = 1.0 / self.target_fps
-        current_frame_time = self._get_time() - self.last_frame_time
+        deadline = self.last_frame_time + 1.0 / self.target_fps
+        remaining = deadline - self._get_time()
         
-        if current_frame_time < target_frame_time:
-            import time
-            time.sleep(target_frame_time - current_frame_time)
+        if remaining > 2 * self.FRAME_SPIN_MARGIN:
+            sleep(remaining - self.FRAME_SPIN_MARGIN)
+        while self._get_time() < deadline:
+            pass
     
     def get_fps(self) -> float:
         """Get current FPS."""
@@ -1255,17 +2661,38 @@ game_manager = GameObjectManager()
 
 # --- Built-in Functions for Engage Integration ---
 
+_NO_DEFAULT = object()
+
+def _unwrap_arg(value, message: str, default=_NO_DEFAULT):
+    """
+    Get the Python value of a builtin argument.
+    
+    Accepts Engage values and anything else with a .value (such as mock
+    objects in tests).
+    
+    Args:
+        value: The argument as passed to the builtin
+        message: Error message for an argument without a value
+        default: Returned instead of raising, for optional arguments
+    
+    Raises:
+        TypeError: With the given message if the argument has no value and there is no default
+    """
+    try:
+        return value.value
+    except AttributeError:
+        if default is _NO_DEFAULT:
+            raise TypeError(message) from None
+        return default
+
 def create_game_object_builtin(args):
     """Built-in function to create a game object."""
-    from engage_interpreter import String
-    
     object_type = "GameObject"
-    if len(args) > 0:
-        # Handle both real String objects and mock objects for testing
-        if hasattr(args[0], 'value'):
-            object_type = args[0].value
-        elif isinstance(args[0], str):
-            object_type = args[0]
+    if args:
+        # Handle real String objects, mock objects for testing and plain str
+        first = args[0]
+        object_type = _unwrap_arg(first, "Object type must be a string",
+                                  default=first if isinstance(first, str) else object_type)
     
     game_object = GameObject(object_type)
     game_manager.register_object(game_object)
@@ -1274,8 +2701,6 @@ def create_game_object_builtin(args):
 
 def game_set_position_builtin(args):
     """Built-in function to set game object position."""
-    from engage_interpreter import Number
-    
     if len(args) != 3:
         raise TypeError("game_set_position requires 3 arguments: object, x, y")
     
@@ -1284,17 +2709,12 @@ def game_set_position_builtin(args):
     if not isinstance(game_object, GameObject):
         raise TypeError("First argument must be a GameObject")
     
-    # Handle both real Number objects and mock objects for testing
-    if not (hasattr(x, 'value') and hasattr(y, 'value')):
-        raise TypeError("Position coordinates must be numbers")
-    
-    game_object.set_position(x.value, y.value)
+    game_object.set_position(_unwrap_arg(x, "Position coordinates must be numbers"),
+                             _unwrap_arg(y, "Position coordinates must be numbers"))
     return game_object
 
 def game_set_sprite_builtin(args):
     """Built-in function to set game object sprite."""
-    from engage_interpreter import String, Number
-    
     if len(args) < 2:
         raise TypeError("game_set_sprite requires at least 2 arguments: object, sprite_path")
     
@@ -1304,20 +2724,15 @@ def game_set_sprite_builtin(args):
     if not isinstance(game_object, GameObject):
         raise TypeError("First argument must be a GameObject")
     
-    # Handle both real String objects and mock objects for testing
-    if not hasattr(sprite_path, 'value'):
-        raise TypeError("Sprite path must be a string")
+    sprite_path = _unwrap_arg(sprite_path, "Sprite path must be a string")
+    width = _unwrap_arg(args[2], "Sprite width must be a number", default=None) if len(args) > 2 else None
+    height = _unwrap_arg(args[3], "Sprite height must be a number", default=None) if len(args) > 3 else None
     
-    width = args[2].value if len(args) > 2 and hasattr(args[2], 'value') else None
-    height = args[3].value if len(args) > 3 and hasattr(args[3], 'value') else None
-    
-    game_object.set_sprite(sprite_path.value, width, height)
+    game_object.set_sprite(sprite_path, width, height)
     return game_object
 
 def game_check_collision_builtin(args):
     """Built-in function to check collision between two game objects."""
-    from engage_interpreter import Number
-    
     if len(args) != 2:
         raise TypeError("game_check_collision requires 2 arguments: object1, object2")
     
@@ -1330,8 +2745,6 @@ def game_check_collision_builtin(args):
 
 def game_add_tag_builtin(args):
     """Built-in function to add a tag to a game object."""
-    from engage_interpreter import String
-    
     if len(args) != 2:
         raise TypeError("game_add_tag requires 2 arguments: object, tag")
     
@@ -1340,26 +2753,15 @@ def game_add_tag_builtin(args):
     if not isinstance(game_object, GameObject):
         raise TypeError("First argument must be a GameObject")
     
-    # Handle both real String objects and mock objects for testing
-    if not hasattr(tag, 'value'):
-        raise TypeError("Tag must be a string")
-    
-    game_object.add_tag(tag.value)
+    game_object.add_tag(_unwrap_arg(tag, "Tag must be a string"))
     return game_object
 
 def game_find_objects_by_tag_builtin(args):
     """Built-in function to find objects by tag."""
-    from engage_interpreter import String, Vector
-    
     if len(args) != 1:
         raise TypeError("game_find_objects_by_tag requires 1 argument: tag")
     
-    tag = args[0]
-    
-    if not hasattr(tag, 'value'):
-        raise TypeError("Tag must be a string")
-    
-    objects = game_manager.get_objects_by_tag(tag.value)
+    objects = game_manager.iter_objects_by_tag(_unwrap_arg(args[0], "Tag must be a string"))
     
     # Return as Vector
     result = Vector()
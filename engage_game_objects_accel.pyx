@@ -0,0 +1,87 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# engage_game_objects_accel.pyx
+# Optional compiled BoundingBox for the Engage game object system.
+#
+# Build in place with:  cythonize -i engage_game_objects_accel.pyx
+# engage_game_objects picks up the compiled class automatically when it is importable.
+
+
+cdef class BoundingBox:
+    """
+    Represents an axis-aligned bounding box for collision detection.
+
+    Drop-in replacement for engage_game_objects.BoundingBox with the fields
+    stored as C doubles; intersects and overlap_area are plain C arithmetic.
+
+    Boxes are immutable: the fields are read-only, so build a new box (or
+    call expand) instead of moving one. The pure Python class follows the
+    same contract.
+    """
+
+    cdef readonly double x, y, width, height
+    cdef readonly double left, top, right, bottom, center_x, center_y
+
+    def __init__(self, double x, double y, double width, double height):
+        self.x = self.left = x
+        self.y = self.top = y
+        self.width = width
+        self.height = height
+        self.right = x + width
+        self.bottom = y + height
+        self.center_x = x + width / 2
+        self.center_y = y + height / 2
+
+    cpdef bint contains_point(self, double x, double y):
+        """Check if a point is inside this bounding box."""
+        return self.x <= x <= self.right and self.y <= y <= self.bottom
+
+    def intersects(self, BoundingBox other not None):
+        """Check if this bounding box intersects with another (touching edges do not count)."""
+        return (self.x < other.right and other.x < self.right and
+                self.y < other.bottom and other.y < self.bottom)
+
+    def get_intersection_rect(self, BoundingBox other not None):
+        """Get the intersection with another bounding box as (x, y, width, height), without allocating a box."""
+        cdef double left = self.x if self.x > other.x else other.x
+        cdef double right = self.right if self.right < other.right else other.right
+        cdef double width = right - left
+        cdef double top, bottom, height
+        if width <= 0:
+            return None
+
+        top = self.y if self.y > other.y else other.y
+        bottom = self.bottom if self.bottom < other.bottom else other.bottom
+        height = bottom - top
+        if height <= 0:
+            return None
+
+        return (left, top, width, height)
+
+    def get_intersection(self, BoundingBox other not None):
+        """Get the intersection rectangle with another bounding box."""
+        rect = self.get_intersection_rect(other)
+        return BoundingBox(*rect) if rect is not None else None
+
+    def overlap_area(self, BoundingBox other not None):
+        """Get the area of overlap with another bounding box (0.0 if they do not overlap)."""
+        cdef double width = ((self.right if self.right < other.right else other.right) -
+                             (self.x if self.x > other.x else other.x))
+        cdef double height = ((self.bottom if self.bottom < other.bottom else other.bottom) -
+                              (self.y if self.y > other.y else other.y))
+        return width * height if width > 0 and height > 0 else 0.0
+
+    def get_overlap_area(self, BoundingBox other not None):
+        """Get the area of overlap with another bounding box."""
+        return self.overlap_area(other)
+
+    def expand(self, double amount):
+        """Create a new bounding box expanded by the given amount."""
+        return BoundingBox(
+            self.x - amount,
+            self.y - amount,
+            self.width + 2 * amount,
+            self.height + 2 * amount
+        )
+
+    def __repr__(self):
+        return f"BoundingBox(x={self.x:.2f}, y={self.y:.2f}, w={self.width:.2f}, h={self.height:.2f})"
@@ -9,6 +9,7 @@ from engage_lexer import Lexer
 from engage_parser import Parser, ASTNode, ProgramNode, VarAssignNode, SetNode, VarAccessNode, BinOpNode, NumberNode, StringNode, FuncDefNode, FuncCallNode, ReturnNode, IfNode, UnaryOpNode, WhileNode, TaskNode, ChannelNode, SendNode, ReceiveNode, FiberDefNode, YieldNode, RecordDefNode, NewInstanceNode, MemberAccessNode, SelfNode, TypeNameNode, TableNode, VectorNode, IndexAccessNode, IndexAssignNode, PropertyDefNode, ImportNode, FromImportNode, ExportVarNode, ExportFuncNode
 from engage_errors import EngageError, ErrorAggregator, create_runtime_error, create_type_error, create_name_error, EngageRuntimeError
 from engage_modules import get_module_system, ModuleNotFoundError, CircularDependencyError
+from engage_compiler import Compiler, CompileError, VM
 
 # Import the core value classes
 from engage_values import Value, Number, String, NoneValue, Function, BuiltInFunction, Channel, Fiber, Record, RecordInstance, BoundMethod, ResultValue, Table, Vector, ModuleValue, SymbolTable
@@ -197,21 +198,62 @@ class StackTrace:
         new_trace.frames = self.frames.copy()
         return new_trace
 
+# --- Binary Operators ---
+# Both operands are already evaluated; 'is an' and 'or return error' need
+# the unevaluated right side and are handled in visit_BinOpNode itself.
+
+def _binop_add(left, right):
+    if isinstance(left, String) or isinstance(right, String): return String(str(left.value) + str(right.value))
+    return Number(left.value + right.value)
+def _binop_sub(left, right): return Number(left.value - right.value)
+def _binop_mul(left, right): return Number(left.value * right.value)
+def _binop_div(left, right):
+    if right.value == 0: raise ZeroDivisionError("Division by zero")
+    return Number(left.value / right.value)
+def _binop_gt(left, right): return Number(1) if left.value > right.value else Number(0)
+def _binop_lt(left, right): return Number(1) if left.value < right.value else Number(0)
+def _binop_eq(left, right): return Number(1) if left.value == right.value else Number(0)
+def _binop_ne(left, right): return Number(1) if left.value != right.value else Number(0)
+def _binop_and(left, right): return Number(1) if left.is_true() and right.is_true() else Number(0)
+def _binop_or(left, right): return Number(1) if left.is_true() or right.is_true() else Number(0)
+
+# Operator spelling -> implementation, so an operator costs one dict lookup
+BINARY_OPERATORS = {
+    'plus': _binop_add, '+': _binop_add, 'concatenated with': _binop_add,
+    'minus': _binop_sub, '-': _binop_sub,
+    'times': _binop_mul, '*': _binop_mul,
+    'divided by': _binop_div, '/': _binop_div,
+    'is greater than': _binop_gt, '>': _binop_gt,
+    'is less than': _binop_lt, '<': _binop_lt,
+    'is': _binop_eq, '==': _binop_eq,
+    'is not': _binop_ne, '!=': _binop_ne,
+    'and': _binop_and,
+    'or': _binop_or,
+}
+
 # --- Interpreter ---
 
 class Interpreter:
+    MAX_RUNTIME_ERRORS = 10  # Limit runtime errors to prevent infinite loops
+
     def __init__(self, file_path=None):
         self.file_path = file_path
         self.stack_trace = StackTrace()
         self.error_aggregator = ErrorAggregator()
         self.current_exports = {}  # Track exports for module system
 
+        # Map each AST node class straight to its bound visitor, so visit()
+        # costs one dict lookup per node instead of building a method name
+        self._dispatch = {
+            node_type: getattr(self, f'visit_{node_type.__name__}', self.no_visit_method)
+            for node_type in ASTNode.__subclasses__()
+        }
+
         # Initialize standard library
         self._initialize_standard_library()
 
     def visit(self, node, context):
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.no_visit_method)
+        method = self._dispatch.get(type(node), self.no_visit_method)
 
         # Track current node for better error reporting
         current_line = getattr(node, 'line', None) or (getattr(node, 'token', None) and node.token.line)
@@ -226,54 +268,49 @@ class Interpreter:
         except Exception as e:
             # Enhance runtime errors with location information and stack trace
             if not isinstance(e, EngageRuntimeError):
-                # Determine error type based on exception type
-                error_type = "Runtime Error"
-                if isinstance(e, NameError):
-                    error_type = "Name Error"
-                elif isinstance(e, TypeError):
-                    error_type = "Type Error"
-                elif isinstance(e, ZeroDivisionError):
-                    error_type = "Division Error"
-                elif isinstance(e, AttributeError):
-                    error_type = "Attribute Error"
-                elif isinstance(e, IndexError):
-                    error_type = "Index Error"
-
-                enhanced_error = EngageRuntimeError(
-                    message=str(e),
-                    line=current_line,
-                    column=current_column,
-                    file_path=self.file_path,
-                    stack_trace=self.stack_trace,
-                    error_type=error_type
-                )
-                raise enhanced_error from e
+                raise self._wrap_runtime_error(e, current_line, current_column) from e
             raise
 
+    def _wrap_runtime_error(self, error, line=None, column=None):
+        """Wrap a Python exception raised by Engage code in an EngageRuntimeError."""
+        # Determine error type based on exception type
+        error_type = "Runtime Error"
+        if isinstance(error, NameError):
+            error_type = "Name Error"
+        elif isinstance(error, TypeError):
+            error_type = "Type Error"
+        elif isinstance(error, ZeroDivisionError):
+            error_type = "Division Error"
+        elif isinstance(error, AttributeError):
+            error_type = "Attribute Error"
+        elif isinstance(error, IndexError):
+            error_type = "Index Error"
+
+        return EngageRuntimeError(
+            message=str(error),
+            line=line,
+            column=column,
+            file_path=self.file_path,
+            stack_trace=self.stack_trace,
+            error_type=error_type
+        )
+
     def no_visit_method(self, node, context):
         raise Exception(f'No visit_{type(node).__name__} method defined')
 
     def visit_ProgramNode(self, node, context):
         result = None
         error_count = 0
-        max_errors = 10  # Limit runtime errors to prevent infinite loops
+        max_errors = self.MAX_RUNTIME_ERRORS
 
         for statement in node.statements:
             try:
                 result = self.visit(statement, context)
-                if isinstance(result, (ReturnValue, YieldValue)):
+                if result.__class__ is ReturnValue or result.__class__ is YieldValue:
                     return result.value
             except EngageRuntimeError as e:
                 error_count += 1
-
-                # Print the error but continue execution
-                print(f"\nRuntime Error {error_count}:")
-                print(e.format_compact_error())
-                print("Continuing execution...\n")
-
-                # If we hit too many errors, stop execution
-                if error_count >= max_errors:
-                    print(f"Too many runtime errors ({max_errors}). Stopping execution.")
+                if self._report_runtime_error(e, error_count):
                     break
 
                 # Continue with next statement
@@ -291,6 +328,19 @@ class Interpreter:
 
         return result
 
+    def _report_runtime_error(self, error, error_count):
+        """Print a top-level statement's runtime error; returns True once execution should stop."""
+        # Print the error but continue execution
+        print(f"\nRuntime Error {error_count}:")
+        print(error.format_compact_error())
+        print("Continuing execution...\n")
+
+        # If we hit too many errors, stop execution
+        if error_count >= self.MAX_RUNTIME_ERRORS:
+            print(f"Too many runtime errors ({self.MAX_RUNTIME_ERRORS}). Stopping execution.")
+            return True
+        return False
+
     def _initialize_standard_library(self):
         """Initialize the standard library modules."""
         stdlib = get_standard_library()
@@ -386,21 +436,10 @@ class Interpreter:
 
         # For all other operations, evaluate both sides
         left = self.visit(node.left_node, context); right = self.visit(node.right_node, context)
-        if op in ('plus', '+', 'concatenated with'):
-            if isinstance(left, String) or isinstance(right, String): return String(str(left.value) + str(right.value))
-            return Number(left.value + right.value)
-        elif op in ('minus', '-'): return Number(left.value - right.value)
-        elif op in ('times', '*'): return Number(left.value * right.value)
-        elif op in ('divided by', '/'):
-            if right.value == 0: raise ZeroDivisionError("Division by zero")
-            return Number(left.value / right.value)
-        elif op in ('is greater than', '>'): return Number(1) if left.value > right.value else Number(0)
-        elif op in ('is less than', '<'): return Number(1) if left.value < right.value else Number(0)
-        elif op in ('is', '=='): return Number(1) if left.value == right.value else Number(0)
-        elif op in ('is not', '!='): return Number(1) if left.value != right.value else Number(0)
-        elif op == 'and': return Number(1) if left.is_true() and right.is_true() else Number(0)
-        elif op == 'or': return Number(1) if left.is_true() or right.is_true() else Number(0)
-        raise TypeError(f"Unsupported operand types for {op}")
+        operator = BINARY_OPERATORS.get(op)
+        if operator is None:
+            raise TypeError(f"Unsupported operand types for {op}")
+        return operator(left, right)
 
     def visit_UnaryOpNode(self, node, context):
         op = node.op_token.value
@@ -459,8 +498,8 @@ class Interpreter:
             raise TypeError(f"'{callee}' is not a function")
 
     def execute_user_function(self, func, args, context, instance=None):
-        if len(args) != len(func.arg_names):
-            raise TypeError(f"Function '{func.name}' takes {len(func.arg_names)} arguments but {len(args)} were given")
+        if len(args) != func.n_args:
+            raise TypeError(f"Function '{func.name}' takes {func.n_args} arguments but {len(args)} were given")
 
         # Create function context and local variables for stack trace
         func_context = SymbolTable(parent=context)
@@ -470,8 +509,8 @@ class Interpreter:
             func_context.set("self", instance)
             local_vars["self"] = f"<instance of {instance.record_class.name}>"
 
+        func.bind(func_context.symbols, args)
         for i, arg_name in enumerate(func.arg_names):
-            func_context.set(arg_name, args[i])
             # Store argument values for stack trace
             try:
                 if hasattr(args[i], 'value'):
@@ -504,7 +543,7 @@ class Interpreter:
                     frame.update_location(current_line, current_column)
 
                 result = self.visit(statement, func_context)
-                if isinstance(result, ReturnValue):
+                if result.__class__ is ReturnValue:
                     self.stack_trace.pop_frame()
                     return result.value
         except ReturnException as e:
@@ -525,13 +564,13 @@ class Interpreter:
                 result = None
                 for statement in statements:
                     result = self.visit(statement, context)
-                    if isinstance(result, (ReturnValue, YieldValue)): return result
+                    if result.__class__ is ReturnValue or result.__class__ is YieldValue: return result
                 return result if result else Number(0)
         if node.else_case:
             result = None
             for statement in node.else_case:
                 result = self.visit(statement, context)
-                if isinstance(result, (ReturnValue, YieldValue)): return result
+                if result.__class__ is ReturnValue or result.__class__ is YieldValue: return result
             return result if result else Number(0)
         return Number(0)
 
@@ -540,7 +579,7 @@ class Interpreter:
         while self.visit(node.condition_node, context).is_true():
             for statement in node.body_nodes:
                 result = self.visit(statement, context)
-                if isinstance(result, (ReturnValue, YieldValue)): return result
+                if result.__class__ is ReturnValue or result.__class__ is YieldValue: return result
         return result
 
     def visit_ReturnNode(self, node, context): return ReturnValue(self.visit(node.node_to_return, context) if node.node_to_return else Number(0))
@@ -1027,8 +1066,10 @@ class Interpreter:
         self.current_exports[name] = value
 
 class ReturnValue:
+    __slots__ = ('value',)
     def __init__(self, value): self.value = value
 class YieldValue:
+    __slots__ = ('value',)
     def __init__(self, value): self.value = value
 
 class ReturnException(Exception):
@@ -1268,10 +1309,7 @@ def list_module_functions(module_name: str):
 
 
 # --- Main Execution Function ---
-def run(code, symbol_table, file_path=None):
-    from engage_lexer import Lexer
-    from engage_parser import Parser
-
+def run(code, symbol_table, file_path=None, use_vm=True):
     # Enhanced error reporting integration
     lexer = Lexer(code, file_path)
 
@@ -1309,7 +1347,18 @@ def run(code, symbol_table, file_path=None):
             context=symbol_table
         )
 
-        result = interpreter.visit(ast, symbol_table)
+        # Run on the bytecode VM unless the program has to be tree-walked
+        program = None
+        if use_vm:
+            try:
+                program = Compiler().compile_program(ast)
+            except CompileError:
+                pass
+
+        if program is not None:
+            result = VM(interpreter).run(program, symbol_table)
+        else:
+            result = interpreter.visit(ast, symbol_table)
 
         # Pop main frame
         interpreter.stack_trace.pop_frame()
@@ -0,0 +1,128 @@
+# engage_suggest_core.py
+# Pure-Python string distance kernels for the Engage error suggestion engine.
+#
+# Everything here is fully type-annotated so the module can be compiled
+# ahead of time with mypyc (`mypyc engage_suggest_core.py`); the compiled
+# extension is then imported in place of this file with the same API.
+
+from typing import List, Sequence
+
+
+def levenshtein(s1: str, s2: str, max_distance: int = -1) -> int:
+    """
+    Calculate Levenshtein distance between two strings.
+
+    Args:
+        s1: First string
+        s2: Second string
+        max_distance: Optional bound (-1 for none); if the distance exceeds
+            it, max_distance + 1 is returned as soon as that is certain
+
+    Returns:
+        Edit distance between the strings
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    # Identifiers are almost always ASCII; as bytes, each character is a
+    # small int and comparisons skip Unicode kind handling
+    if s1.isascii() and s2.isascii():
+        return _levenshtein_codes(s1.encode('ascii'), s2.encode('ascii'), max_distance)
+    return _levenshtein_codes([ord(c) for c in s1], [ord(c) for c in s2], max_distance)
+
+
+def _levenshtein_codes(s1: Sequence[int], s2: Sequence[int], max_distance: int) -> int:
+    """Levenshtein DP over character codes; s1 must be the longer sequence."""
+    s2_len = len(s2)
+    if s2_len == 0:
+        return len(s1) if max_distance < 0 else min(len(s1), max_distance + 1)
+
+    # A single row updated in place: `diagonal` carries the previous
+    # row's value from the column to the left and `left` the value just
+    # written, so each cell reads the row only once
+    if max_distance < 0:
+        row: List[int] = list(range(s2_len + 1))
+        for i, c1 in enumerate(s1):
+            diagonal = row[0]
+            left = i + 1
+            row[0] = left
+            for j, c2 in enumerate(s2, 1):
+                above = row[j]
+                # Explicit compares avoid the variadic min() call per cell
+                cost = left + 1
+                insertions = above + 1
+                if insertions < cost:
+                    cost = insertions
+                substitutions = diagonal + (c1 != c2)
+                if substitutions < cost:
+                    cost = substitutions
+                row[j] = cost
+                diagonal = above
+                left = cost
+
+        return row[s2_len]
+
+    # Bounded: only cells within max_distance of the diagonal can stay
+    # within budget, so the rest read as the cap, and the search stops
+    # once a whole row is over budget
+    cap = max_distance + 1
+    if len(s1) - s2_len > max_distance:
+        return cap
+
+    row = [j if j <= max_distance else cap for j in range(s2_len + 1)]
+    for i, c1 in enumerate(s1):
+        band_start = i - max_distance if i > max_distance else 0
+        band_end = min(s2_len, i + max_distance + 1)
+        if band_start == 0:
+            diagonal = row[0]
+            left = i + 1 if i < max_distance else cap
+            row[0] = left
+        else:
+            diagonal = row[band_start]
+            left = cap
+        row_min = left
+        for j in range(band_start + 1, band_end + 1):
+            above = row[j]
+            cost = left + 1
+            insertions = above + 1
+            if insertions < cost:
+                cost = insertions
+            substitutions = diagonal + (c1 != s2[j - 1])
+            if substitutions < cost:
+                cost = substitutions
+            if cost > cap:
+                cost = cap
+            row[j] = cost
+            if cost < row_min:
+                row_min = cost
+            diagonal = above
+            left = cost
+        if row_min >= cap:
+            return cap
+
+    return row[s2_len]
+
+
+def is_transposition(str1: str, str2: str) -> bool:
+    """
+    Check if two strings differ by exactly one character transposition.
+
+    Args:
+        str1: First string
+        str2: Second string
+
+    Returns:
+        True if strings differ by one transposition
+    """
+    length = len(str1)
+    if length != len(str2) or str1 == str2:
+        return False
+
+    # The strings differ, so a first mismatch exists; a transposition swaps
+    # it with the next character and leaves the rest (one C compare) equal
+    i = 0
+    while str1[i] == str2[i]:
+        i += 1
+    return (i + 1 < length
+            and str1[i] == str2[i + 1] and str1[i + 1] == str2[i]
+            and str1[i + 2:] == str2[i + 2:])
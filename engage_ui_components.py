@@ -4,6 +4,7 @@
 from engage_values import Value, Function, BuiltInFunction, SymbolTable
 from engage_errors import EngageRuntimeError
 import uuid
+from collections import deque
 from typing import Dict, List, Optional, Callable, Any
 
 # --- Base UI Component System ---
@@ -310,7 +311,7 @@ class UIComponentManager:
     def __init__(self):
         self.components = {}  # component_id -> component
         self.root_components = []  # Components without parents
-        self.event_queue = []
+        self.event_queue = deque()  # FIFO; popleft is O(1)
         self.renderer = None
     
     def register_component(self, component: UIComponent):
@@ -365,7 +366,7 @@ class UIComponentManager:
     def process_events(self, context=None):
         """Process all queued events."""
         while self.event_queue:
-            event = self.event_queue.pop(0)
+            event = self.event_queue.popleft()
             
             if event.source_component:
                 event.source_component.trigger_event(event, context)
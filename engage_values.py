@@ -3,21 +3,33 @@
 # It is designed to be imported by the interpreter, standard library, and other
 # components without creating circular dependencies.
 
+import itertools
 import queue
 
 class Value:
     """Base class for all runtime values."""
+    __slots__ = ('context',)
     def __init__(self):
         self.set_context()
     def set_context(self, context=None):
         self.context = context
         return self
+    def __setstate__(self, state):
+        # Images saved before the core values had __slots__ pickled a __dict__;
+        # slotted values pickle (__dict__ or None, slot values)
+        if isinstance(state, tuple):
+            state = {name: value for part in state if part for name, value in part.items()}
+        for name, value in state.items():
+            setattr(self, name, value)
     def is_true(self):
         return False
 
 class Number(Value):
+    __slots__ = ('value',)
     def __init__(self, value):
-        super().__init__()
+        # Numbers are made on every arithmetic step; set the context inline
+        # rather than through Value.__init__ and set_context
+        self.context = None
         self.value = value
     def __repr__(self):
         return str(self.value)
@@ -25,6 +37,7 @@ class Number(Value):
         return self.value != 0
 
 class String(Value):
+    __slots__ = ('value',)
     def __init__(self, value):
         super().__init__()
         self.value = value
@@ -34,6 +47,7 @@ class String(Value):
         return len(self.value) > 0
 
 class NoneValue(Value):
+    __slots__ = ('value',)
     def __init__(self):
         super().__init__()
         self.value = None
@@ -42,16 +56,63 @@ class NoneValue(Value):
     def is_true(self):
         return False
 
+# Argument binders, one per distinct parameter list
+_binders = {}
+
+def make_binder(arg_names):
+    """
+    Get a function that binds call arguments to parameter names.
+
+    The binder is generated with one store per parameter, so a call does
+    no loop or SymbolTable.set call per argument.
+
+    Args:
+        arg_names: Parameter names, in order
+
+    Returns:
+        bind(symbols, args), which stores args[i] under arg_names[i] in the symbols dict
+    """
+    key = tuple(arg_names)
+    binder = _binders.get(key)
+    if binder is None:
+        stores = [f"    symbols[{name!r}] = args[{i}]" for i, name in enumerate(key)] or ["    pass"]
+        namespace = {}
+        exec("\n".join(["def bind(symbols, args):", *stores]), namespace)
+        binder = _binders[key] = namespace['bind']
+    return binder
+
 class Function(Value):
+    __slots__ = ('name', 'body_node', 'arg_names', 'n_args', 'bind', 'code')
+
     def __init__(self, name, body_node, arg_names):
         super().__init__()
         self.name = name or "<anonymous>"
         self.body_node = body_node
-        self.arg_names = arg_names
+        self.arg_names = tuple(arg_names)
+        self.n_args = len(self.arg_names)
+        self.bind = make_binder(self.arg_names)
+        self.code = None  # Bytecode set by engage_compiler (False: the body runs on the Interpreter)
+    def __getstate__(self):
+        # The generated binder is not picklable; it is rebuilt from arg_names
+        return (self.context, self.name, self.body_node, self.arg_names, self.code)
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # Images saved before Function had __slots__ pickled its __dict__;
+            # their bytecode is not kept, it is compiled again on first call
+            self.context = state.get('context')
+            self.name = state['name']
+            self.body_node = state['body_node']
+            self.arg_names = tuple(state['arg_names'])
+            self.code = None
+        else:
+            self.context, self.name, self.body_node, self.arg_names, self.code = state
+        self.n_args = len(self.arg_names)
+        self.bind = make_binder(self.arg_names)
     def __repr__(self):
         return f"<function {self.name}>"
 
 class BuiltInFunction(Value):
+    __slots__ = ('name', 'func_ptr')
     def __init__(self, name, func_ptr):
         super().__init__()
         self.name = name
@@ -251,10 +312,25 @@ class ModuleValue(Value):
         """Get an attribute from the module."""
         return self.exports.get(name)
 
+# Source of SymbolTable versions; each one is unique across all tables
+_symbol_table_versions = itertools.count()
+
 class SymbolTable:
+    __slots__ = ('symbols', 'parent', 'version')
     def __init__(self, parent=None):
         self.symbols = {}
         self.parent = parent
+        # Changes whenever a name is bound here, so lookup caches keyed by it
+        # can tell both this table and its state from any other
+        self.version = next(_symbol_table_versions)
+    def __getstate__(self):
+        return (self.symbols, self.parent)
+    def __setstate__(self, state):
+        if isinstance(state, dict):  # Saved before SymbolTable had __slots__
+            state = (state['symbols'], state['parent'])
+        self.symbols, self.parent = state
+        # Versions are only unique within one process, so take a new one
+        self.version = next(_symbol_table_versions)
     def get(self, name):
         value = self.symbols.get(name, None)
         if value is None and self.parent:
@@ -262,3 +338,4 @@ class SymbolTable:
         return value
     def set(self, name, value):
         self.symbols[name] = value
+        self.version = next(_symbol_table_versions)
@@ -0,0 +1,31 @@
+# test_errors.py
+# Checks that EngageError.format_error never returns cached text that no
+# longer matches the error's fields.
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engage_errors import EngageError
+
+
+def test_format_error_follows_direct_field_writes():
+    error = EngageError("Undefined variable 'x'", 2, 5, source_lines=["let a be 1.", "print with x."])
+    assert "Line 2, Column 5: Undefined variable 'x'" in error.format_error()
+
+    error.message = "Undefined variable 'y'"
+    error.line = 1
+    error.column = 3
+    error.error_type = "Name Error"
+    formatted = error.format_error()
+    assert formatted.startswith("Name Error:")
+    assert "Line 1, Column 3: Undefined variable 'y'" in formatted
+    assert "let a be 1." in formatted
+
+    error.file_path = "game.engage"
+    assert error.format_error().startswith("Name Error in game.engage:")
+
+    error.add_suggestion("Did you mean 'a'?")
+    assert "Did you mean 'a'?" in error.format_error()
@@ -0,0 +1,157 @@
+# test_game_objects.py
+# Checks that GameObjectManager's collision broad phases agree with each
+# other, and that direct writes to a game object's transform and collision
+# box reach the GameObjectRegistry columns the sweep runs on.
+
+import math
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engage_game_objects import GameObject, GameObjectManager, Transform
+
+pytest.importorskip("numpy")  # The registry keeps no columns without numpy
+
+
+def make_scene():
+    """Two 32x32 boxes, 100 apart, in a manager using the registry's sweep."""
+    manager = GameObjectManager()
+    manager.broadphase_mode = "sweep"
+    mover = GameObject("Mover")
+    target = GameObject("Target")
+    target.set_position(100, 0)
+    for game_object in (mover, target):
+        manager.register_object(game_object)
+    hits = []
+    target.add_event_handler("collision", lambda event: hits.append(event.data["other_object"]))
+    return manager, mover, target, hits
+
+
+def column(manager, game_object, field):
+    registry = manager.registry
+    return registry._columns[registry.FIELDS.index(field), game_object._registry_index]
+
+
+def test_direct_position_write_reaches_collisions():
+    manager, mover, target, hits = make_scene()
+    manager.check_collisions()
+    assert hits == []
+
+    mover.transform.x = 90
+    assert column(manager, mover, 'x') == 90
+    manager.check_collisions()
+    assert hits == [mover]
+
+    mover.transform.y = 500
+    assert column(manager, mover, 'y') == 500
+    manager.check_collisions()
+    assert hits == [mover]
+
+
+def test_direct_rotation_write_reaches_cached_trig():
+    transform = Transform()
+    assert transform.get_forward_vector() == (1.0, 0.0)
+    transform.get_world_matrix()
+
+    transform.rotation = 90
+    forward_x, forward_y = transform.get_forward_vector()
+    assert forward_x == pytest.approx(0.0, abs=1e-12) and forward_y == pytest.approx(1.0)
+    a, b, c, d, tx, ty = transform.get_world_matrix()
+    assert (a, b, c, d) == pytest.approx((0.0, -1.0, 1.0, 0.0), abs=1e-12)
+
+    transform.rotation = 450  # Normalized like set_rotation
+    assert transform.rotation == 90
+
+
+def test_rotation_radians_follow_every_write():
+    transform = Transform(rotation=-90)
+    assert transform.rotation == 270
+    assert transform.get_rotation_radians() == pytest.approx(math.radians(270))
+
+    transform.rotation = 45
+    assert transform.get_rotation_radians() == pytest.approx(math.pi / 4)
+    transform.rotate(45)
+    assert transform.get_rotation_radians() == pytest.approx(math.pi / 2)
+    assert transform.copy().get_rotation_radians() == transform.get_rotation_radians()
+
+
+def test_direct_scale_and_size_writes_reach_collisions():
+    manager, mover, target, hits = make_scene()
+
+    mover.transform.scale_x = 8
+    assert column(manager, mover, 'scale_x') == 8
+    assert mover.get_bounding_box().width == 256
+    manager.check_collisions()
+    assert hits == [mover]
+
+    mover.transform.scale_x = 1
+    mover.collision_width = 256
+    assert column(manager, mover, 'collision_width') == 256
+    manager.check_collisions()
+    assert hits == [mover, mover]
+
+
+def test_new_transform_reaches_collisions():
+    manager, mover, target, hits = make_scene()
+    mover.transform = Transform(95, 0)
+    assert column(manager, mover, 'x') == 95
+    manager.check_collisions()
+    assert hits == [mover]
+
+    mover.transform.x = -200
+    manager.check_collisions()
+    assert hits == [mover]
+
+
+def test_generated_ids_never_replace_other_objects():
+    manager = GameObjectManager()
+    generated = GameObject("Enemy")
+    manager.register_object(generated)
+    supplied = GameObject("Enemy", object_id=generated.object_id)
+    manager.register_object(supplied)
+    assert manager.get_object(supplied.object_id) is supplied
+    assert manager.get_object(generated.object_id) is generated
+    assert generated.object_id != supplied.object_id
+
+    newcomer = GameObject("Enemy")
+    claimed = GameObject("Enemy", object_id=f"Enemy_{newcomer._int_id}")
+    manager.register_object(claimed)
+    manager.register_object(newcomer)
+    assert manager.get_object(claimed.object_id) is claimed
+    assert manager.get_object(newcomer.object_id) is newcomer
+    assert len(manager.objects) == 4
+
+
+def test_generated_ids_never_replace_descendants():
+    root = GameObject("Root")
+    child = GameObject("Part")
+    root.add_child(child)
+    twin = GameObject("Part", object_id=child.object_id)
+    root.add_child(twin)
+    assert root.find_child_by_id(twin.object_id) is twin
+    assert root.find_child_by_id(child.object_id) is child
+    assert child.object_id != twin.object_id
+
+
+def test_grid_and_sweep_dispatch_pairs_in_the_same_order():
+    orders = []
+    for mode in ("grid", "sweep"):
+        manager = GameObjectManager()
+        manager.broadphase_mode = mode
+        objects = [GameObject("Box") for _ in range(12)]
+        # Register in an order unrelated to position so cells fill out of order
+        for index in (7, 2, 11, 0, 5, 9, 3, 1, 10, 4, 8, 6):
+            objects[index].set_position((index % 4) * 20, (index // 4) * 20)
+            manager.register_object(objects[index])
+        hits = []
+        for game_object in objects:
+            game_object.add_event_handler(
+                "collision", lambda event: hits.append((event.source_object, event.data["other_object"])))
+        manager.update_all(0.0)
+        manager.check_collisions()
+        orders.append([(objects.index(a), objects.index(b)) for a, b in hits])
+    assert orders[0] and orders[0] == orders[1]
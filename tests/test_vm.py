@@ -0,0 +1,224 @@
+# test_vm.py
+# Checks that the bytecode VM (engage_compiler) behaves exactly like the
+# tree-walking Interpreter: every program here is run both ways and the
+# printed output, error reports included, must match.
+
+import glob
+import io
+import os
+import pickle
+import sys
+from contextlib import redirect_stdout, redirect_stderr
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engage_interpreter import run, Lexer, Parser
+from engage_compiler import Compiler
+from engage_vm import bootstrap_image
+from engage_values import Function, SymbolTable
+
+
+def run_engage(code, use_vm, *more_code):
+    """Run code (then each of more_code in the same symbol table) and return everything printed."""
+    out = io.StringIO()
+    with redirect_stdout(out), redirect_stderr(out):
+        symbol_table = bootstrap_image()
+        for source in (code, *more_code):
+            run(source, symbol_table, use_vm=use_vm)
+    return out.getvalue()
+
+
+def assert_same_output(code, *more_code):
+    """Assert the VM and the Interpreter print the same thing and return that output."""
+    vm_output = run_engage(code, True, *more_code)
+    interpreter_output = run_engage(code, False, *more_code)
+    assert vm_output == interpreter_output
+    return vm_output
+
+
+def compile_function(code):
+    """Compile the body of the first function defined in code."""
+    func_def = Parser(Lexer(code).tokenize()).parse().statements[0]
+    params = [p.value for p in func_def.param_tokens]
+    return Compiler().compile_function(func_def.name_token.value, func_def.body_nodes, params)
+
+
+SLOT_CODE = """
+to sum_to with n:
+    let total be 0.
+    let i be 0.
+    while i is less than n:
+        set total to total plus i.
+        set i to i plus 1.
+    end
+    return total.
+end
+print with sum_to with 10.
+"""
+
+DYNAMIC_SCOPE_CODE = """
+let x be "global x".
+to reads_x with z:
+    return x.
+end
+to has_local_x with z:
+    let x be "local x".
+    return reads_x with 0.
+end
+print with has_local_x with 0.
+print with reads_x with 0.
+to read_before_let with q:
+    let before be x.
+    let x be "mine".
+    return before concatenated with "/" concatenated with x.
+end
+to upper_of_rbl with z:
+    let x be "caller x".
+    return read_before_let with 1.
+end
+print with upper_of_rbl with 0.
+print with read_before_let with 2.
+to sets_outer with z:
+    set x to "set locally".
+    return x.
+end
+print with sets_outer with 0.
+print with x.
+to param_shadow with x:
+    return reads_x with 0.
+end
+print with param_shadow with "param x".
+to deep_unset with n:
+    if n is greater than 0 then
+        let lv be n.
+    end
+    return lv.
+end
+to deep_outer with z:
+    let lv be "outer lv".
+    return deep_unset with 0.
+end
+print with deep_outer with 0.
+print with deep_unset with 2.
+"""
+
+GLOBAL_CACHE_CODE = """
+let g be 1.
+to reads_g with z:
+    return g.
+end
+to bump with n:
+    return n plus 1.
+end
+let i be 0.
+while i is less than 3:
+    print with reads_g with 0.
+    print with bump with i.
+    set g to g times 10.
+    if i is 1 then
+        to bump with n:
+            return n times 100.
+        end
+    end
+    set i to i plus 1.
+end
+"""
+
+SYMBOL_TABLE_CODE = """
+to with_table with n:
+    let t be Table.
+    set t["k"] to n.
+    let shadow be "from with_table".
+    return reads_shadow with 0.
+end
+to reads_shadow with z:
+    return shadow.
+end
+let shadow be "global shadow".
+print with with_table with 3.
+print with reads_shadow with 0.
+"""
+
+ERROR_RECOVERY_CODE = """
+print with undefined_thing.
+print with 1 divided by 0.
+to wrongargs with a:
+    return a.
+end
+print with wrongargs with 1, 2.
+print with "after errors".
+set never_declared to 4.
+to deep with n:
+    return 1 plus deep with n minus 1.
+end
+print with deep with 3.
+print with "end".
+"""
+
+
+def test_examples_match():
+    for path in sorted(glob.glob(os.path.join(ROOT, 'examples', '*.engage'))):
+        if 'guess_the_number' in path:
+            continue  # Reads from stdin
+        with open(path) as f:
+            assert_same_output(f.read())
+
+
+def test_slot_compiled_function():
+    assert compile_function(SLOT_CODE).local_names is not None
+    assert "45" in assert_same_output(SLOT_CODE)
+
+
+def test_dynamic_scoping_and_shadowing():
+    output = assert_same_output(DYNAMIC_SCOPE_CODE)
+    assert output.splitlines()[1:4] == ["local x", "global x", "caller x/mine"]
+
+
+def test_global_cache_sees_set_and_redefinition():
+    output = assert_same_output(GLOBAL_CACHE_CODE).splitlines()
+    assert output[1:] == ["1", "1", "10", "2", "100", "200"]
+
+
+def test_global_cache_across_runs():
+    first = 'let helper be "global".\nto inner with z:\n    return helper.\nend\n'
+    second = ('to outer with z:\n    let helper be 5.\n    return inner with 0.\nend\n'
+              'print with outer with 0.\nprint with inner with 0.\n')
+    assert assert_same_output(first, second).splitlines()[1:] == ["5", "global"]
+
+
+def test_symbol_table_fallback():
+    assert compile_function(SYMBOL_TABLE_CODE).local_names is None
+    output = assert_same_output(SYMBOL_TABLE_CODE)
+    assert "from with_table" in output and "global shadow" in output
+
+
+def test_arity_error():
+    output = assert_same_output("to one with a:\n    return a.\nend\nprint with one with 1, 2.\n")
+    assert "Function 'one' takes 1 arguments but 2 were given" in output
+
+
+def test_statement_error_recovery():
+    output = assert_same_output(ERROR_RECOVERY_CODE)
+    assert "after errors" in output
+    assert "Maximum call stack depth exceeded" in output
+    assert output.rstrip().endswith("end")
+
+
+def test_old_image_state_loads():
+    # Images saved before Function and SymbolTable had __slots__ hold each one's __dict__
+    func_def = Parser(Lexer("to double with x:\n    return x plus x.\nend\n").tokenize()).parse().statements[0]
+    function = Function.__new__(Function)
+    function.__setstate__({'context': None, 'name': 'double', 'body_node': func_def.body_nodes,
+                           'arg_names': ['x']})
+    assert (function.arg_names, function.n_args, function.code) == (('x',), 1, None)
+    old_table = SymbolTable.__new__(SymbolTable)
+    old_table.__setstate__({'symbols': {'double': function}, 'parent': None})
+
+    for use_vm in (True, False):
+        out = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(out):
+            symbol_table = bootstrap_image()
+            symbol_table.set('double', pickle.loads(pickle.dumps(old_table)).get('double'))
+            run("print with double with 21.\n", symbol_table, use_vm=use_vm)
+        assert out.getvalue().splitlines()[-1] == "42"